@@ -0,0 +1,185 @@
+"""
+Benchmarks for Table and OrderedTable.
+
+Builds a seeded dataset for every table shape, times the hot paths of both
+table classes and prints the results as JSON. Results can be written to a
+file with --output and compared against an earlier run with --baseline,
+any benchmark that got slower than the baseline by more than --tolerance
+is reported and the exit status is 1.
+
+    python benchmark.py --shapes 1000x10,10000x40 --output baseline.json
+    python benchmark.py --shapes 1000x10,10000x40 --baseline baseline.json
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import tempfile
+from random import Random
+from timeit import Timer
+
+from orderedtable import OrderedTable
+from table import Table
+
+heading = ['atmosphere', 'bread', 'committee', 'disaster', 'entertainment', 'emphasis', 'temperature', 'history', 'instruction', 'revenue', 'country', 'dirt', 'comparison', 'science', 'stranger', 'community', 'member', 'procedure', 'historian', 'response', 'philosophy', 'fact', 'meaning', 'contribution', 'software', 'moment', 'beer', 'alcohol', 'drawing', 'variation', 'employment', 'user', 'newspaper', 'chemistry', 'buyer', 'championship', 'dealer', 'worker', 'environment', 'discussion', 'administration', 'village', 'apartment', 'product', 'soup', 'appearance', 'meal', 'television', 'construction', 'lab', 'president', 'arrival', 'physics', 'industry', 'idea', 'ladder', 'audience', 'wedding', 'potato', 'employer', 'assignment', 'agency', 'expression', 'quality', 'artisan', 'church', 'activity', 'pizza', 'knowledge', 'desk', 'fortune', 'nature', 'technology', 'region', 'surgery', 'literature', 'requirement', 'pie', 'topic', 'editor', 'insect', 'hat', 'exam', 'oven', 'son', 'poet', 'studio', 'wife', 'equipment', 'decision', 'person', 'opinion', 'income', 'sector', 'examination', 'education', 'hall', 'highway', 'success', 'grandmother', 'setting', 'map', 'gene', 'promotion', 'sir', 'device', 'mood', 'interaction', 'breath', 'shopping', 'context', 'skill', 'negotiation', 'grocery', 'actor', 'bathroom', 'republic', 'steak', 'situation', 'leadership', 'mud', 'information', 'reception', 'love', 'cousin', 'addition', 'chapter', 'category', 'drawer', 'aspect', 'solution', 'method', 'organization', 'family', 'food', 'drama', 'analysis', 'payment', 'bath', 'town', 'feedback', 'guest', 'percentage', 'apple', 'charity', 'instance', 'paper', 'debt', 'currency', 'estate', 'language', 'complaint', 'coffee', 'understanding', 'guidance', 'event', 'night', 'government', 'photo', 'road', 'media', 'goal', 'relationship', 'direction', 'city', 'way', 'basis', 'improvement', 'two', 'speaker', 'salad', 'perspective', 'phone', 'maintenance', 'transportation', 'hotel', 'tongue', 'blood', 'tradition', 'trainer', 'analyst', 'art', 'baseball', 'cheek', 'responsibility', 'fishing', 'mode', 'politics', 'tale', 'ad', 'policy', 'replacement', 'entry', 'operation', 'economics', 'storage', 'communication', 'management', 'theory', 'nation', 'importance', 'recording', 'freedom', 'orange', 'judgment', 'hair', 'definition', 'society', 'piano', 'song', 'proposal', 'assistance', 'unit', 'collection', 'location', 'magazine', 'marriage', 'player', 'election', 'platform', 'teaching', 'funeral', 'role', 'argument', 'outcome', 'law', 'writing', 'system', 'singer', 'confusion', 'reputation', 'departure', 'penalty', 'description', 'selection', 'failure', 'thanks', 'injury', 'difference', 'article', 'impression', 'contract', 'camera', 'health', 'disease', 'obligation', 'month', 'childhood', 'database', 'population', 'people', 'chest', 'medicine', 'honey', 'supermarket', 'attention', 'enthusiasm', 'bird', 'passion', 'area', 'opportunity', 'garbage', 'hospital', 'candidate', 'ability', 'measurement', 'friendship', 'manager', 'winner', 'concept', 'reading', 'possession', 'meat', 'series', 'computer', 'math', 'department', 'presence', 'delivery', 'throat', 'attitude', 'awareness', 'child', 'message', 'emotion', 'sympathy', 'weakness', 'recommendation', 'king', 'profession', 'accident', 'membership', 'professor', 'thing', 'union', 'advertising', 'courage', 'girl', 'difficulty', 'office', 'satisfaction', 'error', 'homework', 'bonus', 'cookie', 'engine', 'teacher', 'director', 'ear', 'memory', 'depth', 'restaurant', 'college', 'housing', 'intention', 'efficiency', 'army', 'secretary', 'session', 'writer', 'cigarette', 'inflation', 'signature', 'vehicle', 'poetry', 'criticism', 'variety', 'girlfriend', 'airport', 'music', 'assistant', 'student', 'application', 'mall', 'university', 'police', 'painting', 'climate', 'reflection', 'safety', 'truth', 'assumption', 'engineering', 'clothes', 'tooth', 'growth', 'basket', 'statement', 'sample', 'warning', 'insurance', 'development', 'bedroom', 'inspection', 'year', 'control', 'poem', 'distribution', 'patience', 'disk', 'cancer', 'initiative', 'appointment', 'manufacturer', 'passenger', 'youth', 'effort', 'advice', 'mom', 'speech', 'permission', 'lady', 'protection', 'data', 'preference', 'connection', 'resolution', 'wood', 'elevator', 'loss', 'pollution', 'refrigerator', 'suggestion', 'strategy', 'explanation', 'conclusion', 'video', 'version', 'priority', 'sister', 'imagination', 'leader', 'library', 'lake', 'introduction', 'world', 'combination', 'possibility', 'cabinet', 'recipe', 'client', 'cell', 'death', 'establishment', 'perception', 'boyfriend', 'property', 'river', 'reality', 'height', 'volume', 'ambition', 'indication', 'relation', 'revolution', 'mixture', 'diamond', 'independence', 'security', 'internet', 'woman', 'menu', 'story', 'virus', 'anxiety', 'agreement', 'flight', 'extent', 'celebration', 'foundation', 'birthday', 'recognition', 'affair', 'wealth', 'chocolate', 'tennis', 'owner', 'preparation', 'ratio', 'scene', 'driver', 'inspector', 'dinner', 'length', 'excitement', 'uncle', 'presentation', 'hearing', 'personality', 'performance', 'customer', 'investment', 'energy', 'county', 'resource', 'finding', 'tea', 'week', 'dad', 'problem', 'movie', 'reaction']
+heading_set = set(heading)
+alphabet = "".join(sorted("qwertyuiopasdfghjklzxcvbnm"))
+DEFAULT_SHAPES = [(1000, 10), (10000, 40), (100000, 40)]
+
+
+def increment(word):
+    if word == "":
+        return alphabet[0]
+    last = word[-1]
+    index = alphabet.index(last)
+    if index == 25:
+        return increment(word[:-1]) + alphabet[0]
+    else:
+        return word[:-1] + alphabet[index+1]
+
+
+def make_row_ids(rows):
+    """row ids a, b, ..., z, aa, ... skipping any id that is also a column id"""
+    row_ids = list()
+    row_id = ""
+    for _ in range(rows):
+        row_id = increment(row_id)
+        while row_id in heading_set:
+            row_id = increment(row_id)
+        row_ids.append(row_id)
+    return row_ids
+
+
+def make_dataset(rows, columns, seed=0):
+    """returns column ids, row ids and rows of random ints, the same for the same arguments"""
+    if columns > len(heading):
+        raise ValueError(f"at most {len(heading)} columns are supported")
+    random = Random(seed)
+    data = [[random.randint(1, 1000000) for _ in range(columns)] for _ in range(rows)]
+    return heading[:columns], make_row_ids(rows), data
+
+
+def write_csv(filepath, column_ids, row_ids, data):
+    with open(filepath, "w", newline="") as rawfile:
+        csvfile = csv.writer(rawfile)
+        csvfile.writerow(["id"] + column_ids)
+        csvfile.writerows([row_id] + row for row_id, row in zip(row_ids, data))
+
+
+def table_cases(column_ids, row_ids, data, csv_path):
+    table = Table(column_ids, row_ids, data)
+    row_id = row_ids[len(row_ids) // 2]
+    column_id = column_ids[len(column_ids) // 2]
+    return {
+        "construct": lambda: Table(column_ids, row_ids, data),
+        "point_lookup": lambda: table[row_id][column_id],
+    }
+
+
+def ordered_table_cases(column_ids, row_ids, data, csv_path):
+    table = OrderedTable(column_ids, row_ids, data)
+    row_id = row_ids[len(row_ids) // 2]
+    column_id = column_ids[len(column_ids) // 2]
+    first_row, last_row = row_ids[len(row_ids) // 4], row_ids[3 * len(row_ids) // 4]
+    first_column, last_column = column_ids[len(column_ids) // 4], column_ids[3 * len(column_ids) // 4]
+    top = table[:row_id]
+    bottom = table[row_id:]
+    return {
+        "construct": lambda: OrderedTable(column_ids, row_ids, data),
+        "point_lookup": lambda: table[row_id][column_id],
+        "row_slice": lambda: table[first_row:last_row].data,
+        "column_slice": lambda: table[first_column:last_column].data,
+        "transpose": lambda: table.transpose(),
+        "transpose_copy": lambda: table.transpose().copy(),
+        "csv_load": lambda: OrderedTable.extract_csv(csv_path, parse_data=int),
+        "merge": lambda: top + bottom,
+        "column_sum": lambda: table[column_id].sum(),
+        "groupby": lambda: table.groupby(column_ids[0]).agg({column_id: "sum"}),
+    }
+
+
+IMPLEMENTATIONS = {"Table": table_cases, "OrderedTable": ordered_table_cases}
+
+
+def time_case(function, repeat):
+    """returns the fastest time of a call in seconds"""
+    timer = Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(shapes, repeat=3, seed=0, implementations=None):
+    results = list()
+    with tempfile.TemporaryDirectory() as directory:
+        for rows, columns in shapes:
+            column_ids, row_ids, data = make_dataset(rows, columns, seed)
+            csv_path = os.path.join(directory, f"{rows}x{columns}.csv")
+            write_csv(csv_path, column_ids, row_ids, data)
+            for implementation, make_cases in IMPLEMENTATIONS.items():
+                if implementations and implementation not in implementations:
+                    continue
+                for name, function in make_cases(column_ids, row_ids, data, csv_path).items():
+                    results.append({"implementation": implementation, "benchmark": name,
+                                    "rows": rows, "columns": columns, "seconds": time_case(function, repeat)})
+    return {"python": platform.python_version(), "platform": platform.platform(), "seed": seed,
+            "results": results}
+
+
+def _result_key(result):
+    return result["implementation"], result["benchmark"], result["rows"], result["columns"]
+
+
+def compare(report, baseline, tolerance):
+    """returns the results that are slower than their baseline by more than tolerance"""
+    baseline_seconds = {_result_key(result): result["seconds"] for result in baseline["results"]}
+    regressions = list()
+    for result in report["results"]:
+        seconds = baseline_seconds.get(_result_key(result))
+        if seconds is not None and result["seconds"] > seconds * (1 + tolerance):
+            regressions.append(dict(result, baseline=seconds, ratio=result["seconds"] / seconds))
+    return regressions
+
+
+def parse_shapes(text):
+    shapes = list()
+    for shape in text.split(","):
+        rows, columns = shape.lower().split("x")
+        shapes.append((int(rows), int(columns)))
+    return shapes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shapes", type=parse_shapes, default=DEFAULT_SHAPES,
+                        help="comma separated ROWSxCOLUMNS table shapes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--implementation", action="append", choices=sorted(IMPLEMENTATIONS),
+                        help="only benchmark this table class, can be given more than once")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown against the baseline, 0.2 is 20%%")
+    args = parser.parse_args(argv)
+
+    report = run(args.shapes, args.repeat, args.seed, args.implementation)
+    if args.output:
+        with open(args.output, "w") as rawfile:
+            json.dump(report, rawfile, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline) as rawfile:
+            regressions = compare(report, json.load(rawfile), args.tolerance)
+        for regression in regressions:
+            print("regression: {implementation} {benchmark} {rows}x{columns} "
+                  "{seconds:.6f}s against {baseline:.6f}s ({ratio:.2f}x)".format(**regression), file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Out-of-core cell storage for tables larger than memory.
+
+A ChunkedStore splits the rows of a table into chunks. Every chunk is a
+ColumnStore saved to its own file with write_store, and at most
+cache_chunks of them are held in memory at a time, in least recently used
+order. Reads and writes page chunks in on demand; chunks that were written
+to are saved again when they are evicted or on flush(). The store has the
+same reading and writing methods as ColumnStore, so OrderedTable and its
+views use it unchanged.
+"""
+import os
+import tempfile
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
+from itertools import chain
+
+from columnstore import ColumnStore, read_store, write_store
+from valueindex import add_rows, make_index, update_rows
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "resident", "cache_chunks"])
+
+
+class ChunkedColumn:
+    """a read only sequence over one column of a ChunkedStore, used for aggregations and grouping"""
+    def __init__(self, store, column, rows):
+        self.store = store
+        self.column = column
+        self.rows = rows
+
+    def __getitem__(self, index):
+        return self.store.get(self.rows[index], self.column)
+
+    def __iter__(self):
+        return self.store.iter_column(self.column, self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class ChunkedStore:
+    def __init__(self, column_count, directory=None, cache_chunks=8):
+        if cache_chunks < 1:
+            raise ValueError("cache_chunks must be at least 1")
+        if directory is None:
+            # removed together with the store
+            self._temporary_directory = tempfile.TemporaryDirectory(prefix="orderedtable-")
+            directory = self._temporary_directory.name
+        self.directory = directory
+        self.column_count = column_count
+        self.cache_chunks = cache_chunks
+        self.row_count = 0
+        # the first row of every chunk and its number of rows
+        self.chunk_starts = list()
+        self.chunk_sizes = list()
+        self.indexes = dict()
+        self._cache = OrderedDict()
+        self._dirty = set()
+        self.hits = self.misses = self.evictions = 0
+
+    def _chunk_path(self, number):
+        return os.path.join(self.directory, f"chunk-{number}.bin")
+
+    def _save_chunk(self, number, chunk):
+        with open(self._chunk_path(number), "wb") as rawfile:
+            write_store(rawfile, chunk, dict())
+
+    def _chunk(self, number):
+        """returns a chunk, reading it from disk and evicting the least recently used one when needed"""
+        chunk = self._cache.get(number)
+        if chunk is not None:
+            self.hits += 1
+            self._cache.move_to_end(number)
+            return chunk
+        self.misses += 1
+        # chunks are only ever written by this store, so they may hold values of any type
+        _, chunk = read_store(self._chunk_path(number), use_mmap=False, trusted=True)
+        self._cache[number] = chunk
+        while len(self._cache) > self.cache_chunks:
+            self._evict()
+        return chunk
+
+    def _evict(self):
+        number, chunk = self._cache.popitem(last=False)
+        self.evictions += 1
+        if number in self._dirty:
+            self._save_chunk(number, chunk)
+            self._dirty.discard(number)
+
+    def flush(self):
+        """saves every chunk that was written to since it was read"""
+        for number in sorted(self._dirty):
+            self._save_chunk(number, self._cache[number])
+        self._dirty.clear()
+
+    def resident_chunks(self):
+        return list(self._cache.values())
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self._cache), self.cache_chunks)
+
+    def append_columns(self, columns, row_count=None):
+        """spills rows given as one buffer per column to disk as a new chunk"""
+        if len(columns) != self.column_count:
+            raise ValueError("the number of appended columns should match the number of columns")
+        chunk = ColumnStore(list(columns), row_count)
+        if not chunk.row_count:
+            return
+        rows = range(self.row_count, self.row_count + chunk.row_count)
+        added = list()
+        try:
+            for column, index in self.indexes.items():
+                add_rows(index, rows, chunk.columns[column])
+                added.append((index, chunk.columns[column]))
+        except TypeError:
+            for index, values in added:
+                for row, value in zip(rows, values):
+                    index.remove(row, value)
+            raise
+        self.chunk_starts.append(self.row_count)
+        self.chunk_sizes.append(chunk.row_count)
+        self.row_count += chunk.row_count
+        self._save_chunk(len(self.chunk_starts) - 1, chunk)
+
+    def create_index(self, column, kind="hash"):
+        self.indexes[column] = make_index(self.column_buffer(column), kind)
+        return self.indexes[column]
+
+    def _locate(self, row):
+        """returns the chunk number of a row and the position of the row in that chunk"""
+        if row < 0:
+            row += self.row_count
+        if not 0 <= row < self.row_count:
+            raise IndexError("row out of range")
+        number = bisect_right(self.chunk_starts, row) - 1
+        return number, row - self.chunk_starts[number]
+
+    def _runs(self, rows=None):
+        """splits rows into (chunk number, positions in that chunk) runs, in the order of rows"""
+        if rows is None:
+            rows = range(self.row_count)
+        if isinstance(rows, range) and rows.step > 0:
+            for number, (start, size) in enumerate(zip(self.chunk_starts, self.chunk_sizes)):
+                # the part of rows that falls in [start, start + size)
+                first = max(0, -(-(start - rows.start) // rows.step))
+                last = min(len(rows), max(0, -(-(start + size - rows.start) // rows.step)))
+                if first < last:
+                    yield number, range(rows[first] - start, rows[last - 1] - start + 1, rows.step)
+            return
+        number = run = None
+        for row in rows:
+            row_number, position = self._locate(row)
+            if row_number != number:
+                if run:
+                    yield number, run
+                number, run = row_number, list()
+            run.append(position)
+        if run:
+            yield number, run
+
+    def get(self, row, column):
+        number, position = self._locate(row)
+        return self._chunk(number).get(position, column)
+
+    def set(self, row, column, value):
+        index = self.indexes.get(column)
+        if index is not None:
+            update_rows(index, (row,), (self.get(row, column),), (value,))
+        number, position = self._locate(row)
+        self._chunk(number).set(position, column, value)
+        self._dirty.add(number)
+
+    def set_column(self, column, rows, new_values):
+        new_values = list(new_values)
+        if len(new_values) != len(rows):
+            raise ValueError(f"expected {len(rows)} values, got {len(new_values)}")
+        index = self.indexes.get(column)
+        if index is not None:
+            update_rows(index, rows, self.column_values(column, rows), new_values)
+        offset = 0
+        for number, positions in self._runs(rows):
+            self._chunk(number).set_column(column, positions, new_values[offset:offset + len(positions)])
+            self._dirty.add(number)
+            offset += len(positions)
+
+    def set_row(self, row, columns, new_values):
+        if not isinstance(new_values, list):
+            new_values = list(new_values)
+        if len(new_values) != len(columns):
+            raise ValueError(f"expected {len(columns)} values, got {len(new_values)}")
+        for column, value in zip(columns, new_values):
+            self.set(row, column, value)
+
+    def column_values(self, column, rows=None):
+        values = list()
+        for number, positions in self._runs(rows):
+            values.extend(self._chunk(number).column_values(column, positions))
+        return values
+
+    def column_buffer(self, column, rows=None):
+        return ChunkedColumn(self, column, range(self.row_count) if rows is None else rows)
+
+    def iter_column(self, column, rows=None):
+        return chain.from_iterable(self._chunk(number).iter_column(column, positions)
+                                   for number, positions in self._runs(rows))
+
+    def row_values(self, row, columns=None):
+        number, position = self._locate(row)
+        return self._chunk(number).row_values(position, columns)
+
+    def iter_row(self, row, columns=None):
+        return iter(self.row_values(row, columns))
+
+    def rows(self, rows=None, columns=None):
+        selected = list()
+        for number, positions in self._runs(rows):
+            selected.extend(self._chunk(number).rows(positions, columns))
+        return selected
+
+    def copy(self, rows=None, columns=None):
+        """copies the selected cells into an in memory ColumnStore"""
+        width = self.column_count if columns is None else len(columns)
+        store = None
+        for number, positions in self._runs(rows):
+            chunk = self._chunk(number).copy(positions, columns)
+            if store is None:
+                store = chunk
+            else:
+                store.append_columns(chunk.columns, chunk.row_count)
+        return store if store is not None else ColumnStore([list() for _ in range(width)], 0)
@@ -0,0 +1,616 @@
+"""
+Columnar cell storage shared by OrderedTable and its TableArray views.
+
+Every table keeps its cells in a single ColumnStore: one buffer per column,
+all buffers the same length. Columns that only hold ints or only hold floats
+are packed into array.array buffers, string columns with few distinct values
+are dictionary encoded into a Categorical, every other column falls back to a
+list of objects. Rows are never stored, they are read across the column buffers.
+A packed or dictionary encoded column that is written a value it can not hold,
+such as an unhashable value in a Categorical, turns back into a list. That
+holds for indexed columns too, unless the index can not hold the value either:
+a sorted index rejects values that do not compare with the column's, and the
+write then raises TypeError and changes nothing.
+
+Writers copy a column on write while a snapshot() still shares it, so a
+snapshot keeps reading the buffers it was taken over without locking.
+
+A store can be written to a file as a pickled header followed by one
+contiguous block per column. Packed columns are read back as memoryviews
+over a memory map of the file, so they are shared through the page cache
+instead of being copied. The header and columns of objects are unpickled,
+and unless the file is trusted only the value types in SAFE_GLOBALS are
+loaded, so a crafted file can not run code when it is read.
+"""
+import io
+import mmap
+import pickle
+import sys
+import threading
+from array import array
+from contextlib import contextmanager
+from functools import partial
+from itertools import repeat
+from operator import eq
+
+from valueindex import add_rows, make_index, update_rows
+
+MAGIC = b"OTSTORE1"
+# every column block starts on a multiple of this many bytes
+ALIGNMENT = 8
+# the one python type each packed typecode holds
+PACKED_TYPES = {"q": int, "d": float}
+# the number of categories each Categorical code typecode can tell apart, smallest first
+CODE_LIMITS = {"B": 1 << 8, "H": 1 << 16, "q": 1 << 63}
+# string columns are dictionary encoded when they have at least this many values
+# and at most this share of them are distinct
+CATEGORICAL_MIN_ROWS = 32
+CATEGORICAL_MAX_RATIO = 0.5
+# the only classes and functions an untrusted store file may refer to, beyond the builtin containers,
+# numbers, strings and bytes that pickle encodes without naming them
+SAFE_GLOBALS = {("builtins", "complex"), ("builtins", "set"), ("builtins", "frozenset"), ("builtins", "bytearray"),
+                ("array", "array"), ("array", "_array_reconstructor"), ("columnstore", "Categorical"),
+                ("datetime", "date"), ("datetime", "datetime"), ("datetime", "time"), ("datetime", "timedelta"),
+                ("datetime", "timezone"), ("decimal", "Decimal")}
+
+
+def make_column(values):
+    """packs values into the most compact buffer that keeps their types"""
+    if not isinstance(values, list):
+        values = list(values)
+    types = set(map(type, values))
+    if types == {int}:
+        try:
+            return array("q", values)
+        except OverflowError:
+            return values
+    elif types == {float}:
+        return array("d", values)
+    elif (types == {str} and len(values) >= CATEGORICAL_MIN_ROWS
+          and len(set(values)) <= len(values) * CATEGORICAL_MAX_RATIO):
+        return Categorical.encode(values)
+    return values
+
+
+def _code_typecode(category_count):
+    for code, limit in CODE_LIMITS.items():
+        if category_count <= limit:
+            return code
+    raise OverflowError("too many categories")
+
+
+class Categorical:
+    """
+    a dictionary encoded column: every distinct value is stored once in categories,
+    and every row holds the small integer code of its value.
+    slices share the categories of the column they were taken from
+    """
+    def __init__(self, categories=(), codes=()):
+        self.categories = list(categories)
+        self.codes_by_value = dict(zip(self.categories, range(len(self.categories))))
+        self.codes = array(_code_typecode(len(self.categories)), codes)
+
+    @classmethod
+    def encode(cls, values):
+        column = cls()
+        column.extend(values)
+        return column
+
+    def _with_codes(self, codes):
+        column = Categorical.__new__(Categorical)
+        column.categories = self.categories
+        column.codes_by_value = self.codes_by_value
+        column.codes = codes
+        return column
+
+    def code(self, value):
+        """returns the code of a value, adding it to the categories when it is new"""
+        code = self.codes_by_value.get(value)
+        if code is None:
+            code = self.codes_by_value[value] = len(self.categories)
+            self.categories.append(value)
+            if len(self.categories) > CODE_LIMITS[self.codes.typecode]:
+                self.codes = array(_code_typecode(len(self.categories)), self.codes)
+        return code
+
+    def _encode(self, values):
+        if isinstance(values, Categorical):
+            translated = [self.code(value) for value in values.categories]
+            codes = map(translated.__getitem__, values.codes)
+        else:
+            codes = list(map(self.code, values))
+        # the typecode is read after encoding, as new categories can widen it
+        return array(self.codes.typecode, codes)
+
+    def extend(self, values):
+        # encoding can widen the codes into a new array, so they are only looked up after it
+        codes = self._encode(values)
+        self.codes.extend(codes)
+
+    def take(self, positions):
+        """a column of the values at a list of positions, sharing the categories"""
+        return self._with_codes(array(self.codes.typecode, map(self.codes.__getitem__, positions)))
+
+    def matches(self, value):
+        """yields whether each row holds value, comparing codes"""
+        code = self.codes_by_value.get(value)
+        if code is None:
+            return repeat(False, len(self.codes))
+        return map(partial(eq, code), self.codes)
+
+    def copy(self):
+        return Categorical(self.categories, self.codes)
+
+    def tolist(self):
+        return list(self)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._with_codes(self.codes[index])
+        return self.categories[self.codes[index]]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.codes[index] = self._encode(value)
+        else:
+            code = self.code(value)
+            self.codes[index] = code
+
+    def __iter__(self):
+        return map(self.categories.__getitem__, self.codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __repr__(self):
+        return f"Categorical({self.tolist()})"
+
+
+def typecode(values):
+    """returns the typecode of a packed column, or None for a column of objects"""
+    if isinstance(values, array):
+        return values.typecode
+    elif isinstance(values, memoryview):
+        return values.format
+    return None
+
+
+def copy_column(values):
+    """copies a column into a buffer that owns its values"""
+    if isinstance(values, array):
+        return values[:]
+    elif isinstance(values, Categorical):
+        return values.copy()
+    elif isinstance(values, memoryview):
+        return array(values.format, values)
+    return make_column(list(values))
+
+
+def convert_column(values, converter=None):
+    """converts a whole column of raw values with a per value converter"""
+    if converter is None:
+        return make_column(values)
+    return make_column(map(converter, values))
+
+
+def infer_column(values):
+    """packs raw strings as ints or floats when every value parses, otherwise keeps the strings"""
+    for converter in (int, float):
+        try:
+            return make_column(map(converter, values))
+        except ValueError:
+            pass
+    return make_column(values)
+
+
+class ColumnStore:
+    def __init__(self, columns, row_count=None):
+        self.columns = columns
+        if row_count is None:
+            row_count = len(columns[0]) if columns else 0
+        self.row_count = row_count
+        # secondary indexes by column position, see valueindex
+        self.indexes = dict()
+        self.read_only = False
+        # held by writers, so a snapshot is never taken in the middle of a write or a batch
+        self._lock = threading.RLock()
+        # columns and indexes a snapshot shares, they are copied before they are written to
+        self._shared_columns = set()
+        self._shared_indexes = set()
+        # the last snapshot, and whether the store was written to since it was taken
+        self._snapshot = None
+        self._changed = True
+        # while a batch runs, the snapshot of the store before it, which is what readers get
+        self._batch_snapshot = None
+
+    def _begin_write(self, columns):
+        """
+        called with the lock held before columns are written to,
+        copies the ones a snapshot shares and read only buffers
+        """
+        if self.read_only:
+            raise TypeError("a snapshot is read only")
+        self._changed = True
+        for column in columns:
+            values = self.columns[column]
+            if column in self._shared_columns:
+                self.columns[column] = values[:] if isinstance(values, list) else copy_column(values)
+                self._shared_columns.discard(column)
+            elif isinstance(values, memoryview) and values.readonly:
+                # a buffer imported from another owner, who sees none of this store's writes
+                self.columns[column] = copy_column(values)
+            if column in self._shared_indexes:
+                self.indexes[column] = self.indexes[column].copy()
+                self._shared_indexes.discard(column)
+
+    def _take_snapshot(self):
+        snapshot = ColumnStore(list(self.columns), self.row_count)
+        snapshot.indexes = dict(self.indexes)
+        snapshot.read_only = True
+        snapshot._snapshot = snapshot
+        snapshot._changed = False
+        self._shared_columns = set(range(len(self.columns)))
+        self._shared_indexes = set(self.indexes)
+        self._snapshot = snapshot
+        self._changed = False
+        return snapshot
+
+    def snapshot(self):
+        """
+        returns a read only store with the last committed cells, in O(columns). readers of a snapshot take no locks.
+        while another thread is in a batch, the snapshot taken when the batch started is returned without waiting,
+        while another thread is in a single write, this waits for the write to finish
+        """
+        if not self._changed:
+            return self._snapshot
+        batch_snapshot = self._batch_snapshot
+        if batch_snapshot is not None:
+            return batch_snapshot
+        with self._lock:
+            if not self._changed:
+                return self._snapshot
+            return self._take_snapshot()
+
+    @contextmanager
+    def batch(self):
+        """holds off other writers and publishes the writes of the with block to snapshots all at once"""
+        with self._lock:
+            if self._batch_snapshot is not None or self.read_only:
+                # a batch nested in another one is published with it
+                yield self
+                return
+            if self._changed:
+                self._take_snapshot()
+            self._batch_snapshot = self._snapshot
+            try:
+                yield self
+            finally:
+                self._batch_snapshot = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_lock"]
+        state["_batch_snapshot"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_rows(cls, data, width):
+        for row in data:
+            if len(row) != width:
+                raise ValueError("every row in data should have the same number of values as there are columns")
+        if not data:
+            return cls([[] for _ in range(width)], 0)
+        return cls([make_column(values) for values in zip(*data)], len(data))
+
+    @classmethod
+    def from_columns(cls, columns):
+        return cls([make_column(values) for values in columns])
+
+    @property
+    def column_count(self):
+        return len(self.columns)
+
+    def create_index(self, column, kind="hash"):
+        with self._lock:
+            index = self.indexes[column] = make_index(self.columns[column], kind)
+            self._shared_indexes.discard(column)
+            return index
+
+    def append_columns(self, columns, row_count=None):
+        """appends rows given as one buffer per column"""
+        with self._lock:
+            self._begin_write(range(len(self.columns)))
+            self._append_columns(columns, row_count)
+
+    def _append_columns(self, columns, row_count=None):
+        if len(columns) != len(self.columns):
+            raise ValueError("the number of appended columns should match the number of columns")
+        self._index_rows(columns, row_count)
+        for i, values in enumerate(columns):
+            current = self.columns[i]
+            if not self.row_count:
+                # an empty store takes the buffers of its first rows, so a column can still be packed
+                self.columns[i] = copy_column(values)
+                continue
+            if isinstance(current, memoryview):
+                # a mapped column can not grow, it is copied out of the file first
+                current = self.columns[i] = copy_column(current)
+            if isinstance(current, array):
+                if typecode(values) == current.typecode:
+                    current.extend(values)
+                    continue
+                current = self.columns[i] = current.tolist()
+            current.extend(values)
+        if row_count is None:
+            row_count = len(columns[0]) if columns else 0
+        self.row_count += row_count
+
+    def _index_rows(self, columns, row_count=None):
+        """adds appended rows to every index, or to none of them when a value can not be indexed"""
+        if row_count is None:
+            row_count = len(columns[0]) if columns else 0
+        rows = range(self.row_count, self.row_count + row_count)
+        added = list()
+        try:
+            for column, index in self.indexes.items():
+                add_rows(index, rows, columns[column])
+                added.append((index, columns[column]))
+        except TypeError:
+            for index, values in added:
+                for row, value in zip(rows, values):
+                    index.remove(row, value)
+            raise
+
+    def get(self, row, column):
+        return self.columns[column][row]
+
+    def _unpack(self, column):
+        """turns a packed column into a list so it can hold values of any type"""
+        values = self.columns[column] = self.columns[column].tolist()
+        return values
+
+    def set(self, row, column, value):
+        with self._lock:
+            self._begin_write((column,))
+            self._set(row, column, value)
+
+    def _reindex(self, changes):
+        """
+        moves rows of indexed columns to new values, given as (column, rows, old values, new values).
+        every index is updated or, when a value can not be indexed, none of them, and TypeError is raised
+        """
+        updated = list()
+        try:
+            for column, rows, old_values, new_values in changes:
+                index = self.indexes.get(column)
+                if index is not None:
+                    update_rows(index, rows, old_values, new_values)
+                    updated.append((index, rows, old_values, new_values))
+        except TypeError:
+            for index, rows, old_values, new_values in reversed(updated):
+                update_rows(index, rows, new_values, old_values)
+            raise
+
+    def _set(self, row, column, value):
+        if column in self.indexes:
+            self._reindex([(column, (row,), (self.columns[column][row],), (value,))])
+        self._write(row, column, value)
+
+    def _write(self, row, column, value):
+        """writes a cell without updating the column's index"""
+        values = self.columns[column]
+        code = typecode(values)
+        if code and type(value) is not PACKED_TYPES[code]:
+            values = self._unpack(column)
+        try:
+            values[row] = value
+        except (OverflowError, TypeError):
+            # too big for a packed column, or unhashable for a Categorical
+            self._unpack(column)[row] = value
+
+    def set_column(self, column, rows, new_values):
+        """writes new_values over the selected rows of a column in one slice assignment"""
+        with self._lock:
+            self._begin_write((column,))
+            self._set_column(column, rows, new_values)
+
+    def _set_column(self, column, rows, new_values):
+        # always copied, a whole column keeps the list it is given
+        new_values = list(new_values)
+        if len(new_values) != len(rows):
+            raise ValueError(f"expected {len(rows)} values, got {len(new_values)}")
+        values = self.columns[column]
+        if column in self.indexes:
+            self._reindex([(column, rows, select(values, rows), new_values)])
+        if not isinstance(rows, range):
+            for row, value in zip(rows, new_values):
+                self._write(row, column, value)
+            return
+        if self._is_full(rows, self.row_count):
+            # a whole column is repacked, so it can change between packed types
+            self.columns[column] = make_column(new_values)
+            return
+        code = typecode(values)
+        if code:
+            if set(map(type, new_values)) <= {PACKED_TYPES[code]}:
+                try:
+                    values[as_slice(rows)] = array(code, new_values)
+                    return
+                except (OverflowError, TypeError):
+                    # too big for the column
+                    pass
+            values = self._unpack(column)
+        try:
+            values[as_slice(rows)] = new_values
+        except TypeError:
+            # unhashable values can not be added to a Categorical
+            self._unpack(column)[as_slice(rows)] = new_values
+
+    def set_row(self, row, columns, new_values):
+        if not isinstance(new_values, list):
+            new_values = list(new_values)
+        if len(new_values) != len(columns):
+            raise ValueError(f"expected {len(columns)} values, got {len(new_values)}")
+        with self._lock:
+            self._begin_write(columns)
+            self._reindex([(column, (row,), (self.columns[column][row],), (value,))
+                           for column, value in zip(columns, new_values) if column in self.indexes])
+            for column, value in zip(columns, new_values):
+                self._write(row, column, value)
+
+    def column_values(self, column, rows=None):
+        values = self.columns[column]
+        if rows is not None and not self._is_full(rows, self.row_count):
+            values = select(values, rows)
+        return values.tolist() if typecode(values) else list(values)
+
+    def row_values(self, row, columns=None):
+        if columns is None:
+            return [values[row] for values in self.columns]
+        return [self.columns[column][row] for column in columns]
+
+    def column_buffer(self, column, rows=None):
+        """returns the selected rows of a column as a buffer, without copying when every row is selected"""
+        values = self.columns[column]
+        if rows is None or self._is_full(rows, self.row_count):
+            return values
+        return select(values, rows)
+
+    def iter_column(self, column, rows=None):
+        values = self.columns[column]
+        if rows is None or self._is_full(rows, self.row_count):
+            return iter(values)
+        return map(values.__getitem__, rows)
+
+    def iter_row(self, row, columns=None):
+        if columns is None:
+            return (values[row] for values in self.columns)
+        return (self.columns[column][row] for column in columns)
+
+    def rows(self, rows=None, columns=None):
+        selected = self._select_columns(columns)
+        if rows is not None and not self._is_full(rows, self.row_count):
+            selected = [select(values, rows) for values in selected]
+        return [list(row) for row in zip(*selected)]
+
+    def copy(self, rows=None, columns=None):
+        """copies the selected cells into a new store that shares nothing with this one"""
+        selected = self._select_columns(columns)
+        if rows is None:
+            rows = range(self.row_count)
+        return ColumnStore([copy_column(select(values, rows)) for values in selected], len(rows))
+
+    def _select_columns(self, columns):
+        if columns is None or self._is_full(columns, len(self.columns)):
+            return self.columns
+        return [self.columns[column] for column in columns]
+
+    @staticmethod
+    def _is_full(positions, length):
+        if not isinstance(positions, range):
+            return False
+        return positions.step == 1 and positions.start == 0 and positions.stop == length
+
+
+def select(values, positions):
+    """returns the values at a range or a list of positions, in a buffer of the same kind"""
+    if isinstance(positions, range):
+        return values[as_slice(positions)]
+    code = typecode(values)
+    if code:
+        return array(code, map(values.__getitem__, positions))
+    elif isinstance(values, Categorical):
+        return values.take(positions)
+    return list(map(values.__getitem__, positions))
+
+
+def as_slice(positions):
+    """converts a range of positions into the slice that selects them"""
+    stop = positions.stop if positions.stop >= 0 else None
+    return slice(positions.start, stop, positions.step)
+
+
+def _padding(offset):
+    return -offset % ALIGNMENT
+
+
+def write_store(rawfile, store, header):
+    """writes the header and then every column of the store as a contiguous block"""
+    blocks = list()
+    layout = list()
+    offset = 0
+    for values in store.columns:
+        code = typecode(values)
+        if code:
+            block = memoryview(values).cast("B")
+        else:
+            block = pickle.dumps(values if isinstance(values, Categorical) else list(values),
+                                 pickle.HIGHEST_PROTOCOL)
+        layout.append((code, offset, len(block)))
+        blocks.append(block)
+        offset += len(block) + _padding(len(block))
+    header = dict(header, columns=layout, row_count=store.row_count, byteorder=sys.byteorder)
+    raw_header = pickle.dumps(header, pickle.HIGHEST_PROTOCOL)
+    rawfile.write(MAGIC)
+    rawfile.write(len(raw_header).to_bytes(8, "little"))
+    rawfile.write(raw_header)
+    rawfile.write(bytes(_padding(len(MAGIC) + 8 + len(raw_header))))
+    for block in blocks:
+        rawfile.write(block)
+        rawfile.write(bytes(_padding(len(block))))
+
+
+class _SafeUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if (module, name) not in SAFE_GLOBALS:
+            raise pickle.UnpicklingError(f"refusing to load {module}.{name} from an untrusted table file, "
+                                         f"load it with trusted=True if it comes from a trusted source")
+        return super().find_class(module, name)
+
+
+def _unpickle(data, trusted):
+    if trusted:
+        return pickle.loads(data)
+    return _SafeUnpickler(io.BytesIO(data)).load()
+
+
+def read_store(filepath, use_mmap=True, trusted=False):
+    """
+    reads a file written by write_store, returns its header and a ColumnStore.
+    with use_mmap packed columns are memoryviews over a copy on write map of the file,
+    columns of objects are always unpickled into lists.
+    unless trusted, the pickled parts may only hold the value types in SAFE_GLOBALS,
+    pickle.UnpicklingError is raised for anything else
+    """
+    with open(filepath, "rb") as rawfile:
+        if rawfile.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filepath} is not a saved table")
+        header_length = int.from_bytes(rawfile.read(8), "little")
+        header = _unpickle(rawfile.read(header_length), trusted)
+        start = len(MAGIC) + 8 + header_length
+        start += _padding(start)
+        # a map can only be shared with the file when it was written with this machine's byte order
+        if use_mmap and header["byteorder"] == sys.byteorder:
+            buffer = memoryview(mmap.mmap(rawfile.fileno(), 0, access=mmap.ACCESS_COPY))
+        else:
+            use_mmap = False
+            rawfile.seek(0)
+            buffer = memoryview(rawfile.read())
+    columns = list()
+    for code, offset, length in header["columns"]:
+        block = buffer[start + offset:start + offset + length]
+        if not code:
+            columns.append(_unpickle(block, trusted))
+        elif use_mmap:
+            columns.append(block.cast(code))
+        else:
+            values = array(code)
+            values.frombytes(block)
+            if header["byteorder"] != sys.byteorder:
+                values.byteswap()
+            columns.append(values)
+    return header, ColumnStore(columns, header["row_count"])
@@ -0,0 +1,14 @@
+import pytest
+
+from orderedtable import OrderedTable
+
+
+@pytest.fixture
+def table():
+    column_ids = ["a", "b", "c"]
+    row_ids = ["w", "x", "y", "z"]
+    data = [[1, 1.5, "p"],
+            [5, 2.5, "q"],
+            [9, 3.5, "p"],
+            [20, 4.5, "r"]]
+    return OrderedTable(column_ids, row_ids, data)
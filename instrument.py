@@ -0,0 +1,126 @@
+"""
+Opt-in instrumentation for Table and OrderedTable.
+
+Hot paths report events through count() and timed(). "materialise",
+"copy", "merge" and the "csv.*" parse stages are timed. "lookup" and
+"slice" only build views, so they are counted only. Nothing is recorded
+unless a Profile is active or a hook is added, and while neither is the
+case every report costs a single check of the enabled flag.
+
+    with Profile() as profile:
+        table["Date"::2]["a"::3].data
+    profile.counts    # Counter({"slice": 2, "materialise": 1})
+    profile.seconds   # seconds spent in each timed event
+
+Hooks are called as hook(event, count, seconds), with seconds None for
+events that are only counted.
+
+sizeof() measures objects for memory_usage().
+"""
+import sys
+from array import array
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from time import perf_counter
+
+# true while a Profile is active or a hook is added, checked before any report
+enabled = False
+_profiles = list()
+_hooks = list()
+
+
+def _update_enabled():
+    global enabled
+    enabled = bool(_profiles or _hooks)
+
+
+class Profile:
+    """counts and times events while it is active, profiles can be nested"""
+    def __init__(self):
+        self.counts = Counter()
+        self.seconds = defaultdict(float)
+
+    def __enter__(self):
+        _profiles.append(self)
+        _update_enabled()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _profiles.remove(self)
+        _update_enabled()
+
+    def report(self):
+        return {"counts": dict(self.counts), "seconds": dict(self.seconds)}
+
+
+def add_hook(hook):
+    _hooks.append(hook)
+    _update_enabled()
+
+
+def remove_hook(hook):
+    _hooks.remove(hook)
+    _update_enabled()
+
+
+def count(event, number=1):
+    for profile in _profiles:
+        profile.counts[event] += number
+    for hook in _hooks:
+        hook(event, number, None)
+
+
+class _Timed:
+    """the context manager timed() returns while reports are enabled"""
+    def __init__(self, event):
+        self.event = event
+        self.start = None
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = perf_counter() - self.start
+        for profile in _profiles:
+            profile.counts[self.event] += 1
+            profile.seconds[self.event] += seconds
+        for hook in _hooks:
+            hook(self.event, 1, seconds)
+
+
+# shared by every timed() block while reports are disabled, so those blocks create no objects
+_NOT_TIMED = nullcontext()
+
+
+def timed(event):
+    """counts an event and adds the time spent in the with block to it"""
+    return _Timed(event) if enabled else _NOT_TIMED
+
+
+def sizeof(obj, deep=False, seen=None):
+    """
+    bytes used by an object and, with deep, by everything it holds.
+    objects already in seen are not counted again, so shared values count once
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (array, str, bytes, int, float)):
+        return size
+    elif isinstance(obj, memoryview):
+        # the memory of a mapped column belongs to the page cache, not the process
+        return size
+    elif not deep:
+        if hasattr(obj, "__dict__"):
+            size += sum(sizeof(value, False, seen) for value in vars(obj).values())
+        return size
+    if isinstance(obj, dict):
+        size += sum(sizeof(key, True, seen) + sizeof(value, True, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sizeof(value, True, seen) for value in obj)
+    elif hasattr(obj, "__dict__"):
+        size += sum(sizeof(value, True, seen) for value in vars(obj).values())
+    return size
@@ -0,0 +1,113 @@
+"""
+Arrow style columnar export and import for OrderedTable.
+
+An exported table is a dict of plain values and buffers that code which does
+not know about OrderedTable can read. Buffers are memoryviews; import_column
+accepts any bytes-like object in their place, so they can be copied into
+shared memory or out with bytes() for pickling:
+
+    {"column_ids": [...], "row_ids": [...], "length": rows, "default_value": ...,
+     "columns": [column, ...]}
+
+Every column is a dict with a "type", its "length" and the buffers of that
+type, laid out as in the Arrow columnar format:
+
+    int64, float64  "values", one contiguous buffer of 8 byte values
+    utf8            "offsets", length + 1 int64 offsets into "data", utf-8 bytes
+    dictionary      "indices", codes into "dictionary", an exported column of the
+                    distinct values, "index_type" is the array typecode of the codes
+    object          "values", a list of python objects that has no Arrow layout
+
+and a "validity" bitmap, bit i (least significant bit first) set when row i is
+not None, or None when every row is valid. Packed columns are exported as
+read only memoryviews of the store's own buffers, so nothing is copied, and
+while the export is alive those buffers can not be resized by appending rows.
+A table imported from them copies a shared column the first time it is
+written to, so writes to a shared column must go through the table that
+owns it, which also keeps its indexes and snapshots up to date.
+"""
+from array import array
+
+from columnstore import Categorical, typecode
+
+ARROW_TYPES = {"q": "int64", "d": "float64"}
+TYPECODES = {arrow_type: code for code, arrow_type in ARROW_TYPES.items()}
+
+
+def _validity(values):
+    """returns the validity bitmap of values, or None when no value is None"""
+    if not any(value is None for value in values):
+        return None
+    bitmap = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is not None:
+            bitmap[i >> 3] |= 1 << (i & 7)
+    return memoryview(bytes(bitmap))
+
+
+def _is_valid(validity, i):
+    return validity is None or validity[i >> 3] >> (i & 7) & 1
+
+
+def export_column(values):
+    """exports a column buffer, a memoryview, array, Categorical or list"""
+    column = _export_values(values)
+    column["length"] = len(values)
+    return column
+
+
+def _export_values(values):
+    code = typecode(values)
+    if code:
+        return {"type": ARROW_TYPES[code], "values": memoryview(values).toreadonly(), "validity": None}
+    elif isinstance(values, Categorical):
+        return {"type": "dictionary", "indices": memoryview(values.codes).toreadonly(),
+                "index_type": values.codes.typecode,
+                "dictionary": export_column(values.categories), "validity": None}
+    values = list(values)
+    validity = _validity(values)
+    types = set(map(type, values)) - {type(None)}
+    if types == {int} or types == {float}:
+        packed_type = types.pop()
+        code = "q" if packed_type is int else "d"
+        try:
+            packed = array(code, [packed_type() if value is None else value for value in values])
+        except OverflowError:
+            pass
+        else:
+            return {"type": ARROW_TYPES[code], "values": memoryview(packed), "validity": validity}
+    elif types == {str}:
+        encoded = [b"" if value is None else value.encode("utf-8") for value in values]
+        offsets = array("q", [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        return {"type": "utf8", "offsets": memoryview(offsets), "data": b"".join(encoded), "validity": validity}
+    return {"type": "object", "values": values, "validity": None}
+
+
+def import_column(column):
+    """
+    turns an exported column back into a column buffer.
+    int64 and float64 columns without nulls are memoryviews over the exported buffer, so nothing is copied
+    """
+    column_type = column["type"]
+    length = column["length"]
+    validity = column.get("validity")
+    if column_type in TYPECODES:
+        values = memoryview(column["values"]).cast("B").cast(TYPECODES[column_type])
+        if len(values) != length:
+            raise ValueError(f"expected {length} values, got {len(values)}")
+        if validity is None:
+            return values
+        return [value if _is_valid(validity, i) else None for i, value in enumerate(values)]
+    elif column_type == "utf8":
+        offsets = memoryview(column["offsets"]).cast("B").cast("q")
+        data = bytes(column["data"])
+        return [data[offsets[i]:offsets[i + 1]].decode("utf-8") if _is_valid(validity, i) else None
+                for i in range(length)]
+    elif column_type == "dictionary":
+        indices = memoryview(column["indices"]).cast("B").cast(column["index_type"])
+        return Categorical(import_column(column["dictionary"]), indices)
+    elif column_type == "object":
+        return list(column["values"])
+    raise ValueError(f"unknown column type '{column_type}'")
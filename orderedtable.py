@@ -11,6 +11,9 @@ table[row_1:row_5]          returns a Table instance with a subset of the rows,
 table[col_1:col_5]          returns a Table instance with all rows, and a subset of the columns
 table[row_1:row_5][col_1:col_5]
                             returns a Table instance
+                            slices are views that share the cells of the table they were taken from.
+table.copy()                returns a Table instance that owns its own cells
+table_array.copy()          returns a TableArray instance that owns its own cells
 table[row] = [...]          replaces TableArray.data with the array
 table[column] = [...]       does the same
 table_1[row_1] = table_2[row_2]
@@ -50,39 +53,340 @@ self.data must have __len__, __iter__, be ordered,
 
 """
 import csv
-from timeit import Timer
+import io
+import locale
+import os
+from array import array
+from collections import namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from itertools import compress, islice, repeat
+from operator import and_, eq, itemgetter
+
+import instrument
+from chunkstore import ChunkedStore
+from columnstore import (Categorical, ColumnStore, as_slice, convert_column, infer_column, make_column, read_store,
+                         select, typecode, write_store)
+from instrument import sizeof
+from interchange import export_column, import_column
+from valueindex import add_rows
+
+
+# the default of arguments that can be given as None
+NOT_GIVEN = object()
+
+# how the fields of a csv row are read: the number of fields, the field and parser of every kept column,
+# and the field, parser and predicate of every where filter
+CsvLayout = namedtuple("CsvLayout", ["width", "fields", "parsers", "filters"])
+
+
+def _read_csv_chunk(reader, chunk_rows):
+    """tokenises the next chunk_rows rows of a csv reader"""
+    with instrument.timed("csv.read"):
+        return list(islice(reader, chunk_rows))
+
+
+def _parse_csv_reader(reader, layout, parse_row=None, chunk_rows=100000):
+    """
+    parses the rows left in a csv reader chunk by chunk into row ids and a single store.
+    also returns the types every column with inferred types got in its chunks, see _settle_inferred_types
+    """
+    inferred = [parse is infer_column for parse in layout.parsers]
+    kinds = [set() for _ in layout.parsers]
+    row_ids = list()
+    store = None
+    while True:
+        raw_rows = _read_csv_chunk(reader, chunk_rows)
+        if not raw_rows and store is not None:
+            break
+        chunk_row_ids, columns = OrderedTable._parse_csv_rows(raw_rows, layout, parse_row)
+        del raw_rows
+        for column_kinds, is_inferred, values in zip(kinds, inferred, columns):
+            if is_inferred and len(values):
+                # inferred columns hold only ints, only floats or only strings
+                column_kinds.add(type(values[0]))
+        row_ids.extend(chunk_row_ids)
+        if store is None:
+            store = ColumnStore(columns, len(chunk_row_ids))
+        else:
+            store.append_columns(columns, len(chunk_row_ids))
+    return row_ids, store, kinds
+
+
+def _settle_inferred_types(store, column_ids, kinds):
+    """
+    gives every column with inferred types one type for the whole file. a column with int and float chunks
+    is widened to floats, which is exact. returns a str converter for every column with number and string
+    chunks, whose earlier chunks can not be turned back into the text they were parsed from
+    """
+    text_columns = dict()
+    for column, (column_id, column_kinds) in enumerate(zip(column_ids, kinds)):
+        if len(column_kinds) < 2:
+            continue
+        if str in column_kinds:
+            text_columns[column_id] = str
+        else:
+            store.columns[column] = array("d", store.columns[column])
+    return text_columns
+
+
+def _parse_csv_range(filepath, start, stop, encoding, layout, parse_row, chunk_rows):
+    """parses the lines between two byte offsets of a csv file, runs in a worker process"""
+    with open(filepath, "rb") as rawfile:
+        rawfile.seek(start)
+        text = rawfile.read(stop - start).decode(encoding)
+    return _parse_csv_reader(csv.reader(io.StringIO(text, newline="")), layout, parse_row, chunk_rows)
+
+
+def _as_range(positions):
+    """returns positions as a range when they are consecutive and ascending"""
+    if positions and positions == list(range(positions[0], positions[0] + len(positions))):
+        return range(positions[0], positions[0] + len(positions))
+    return positions
+
+
+def _is_placeholder(value, default_value):
+    """whether a cell holds the default value a merge fills missing cells with"""
+    return value is default_value or value == default_value
+
+
+def _is_nan_pair(value, other_value):
+    """whether both cells hold NaN, which compares unequal to itself"""
+    return value != value and other_value != other_value
+
+
+def _mean(values):
+    if not len(values):
+        raise ValueError("mean of an empty array")
+    return sum(values) / len(values)
+
+
+# reductions over a whole buffer, sum, min and max run over array buffers in C
+AGGREGATIONS = {"sum": sum, "mean": _mean, "min": min, "max": max, "count": len}
+
+
+def _get_aggregation(aggregation):
+    """returns the name and function of an aggregation given by name or as a callable"""
+    if callable(aggregation):
+        return aggregation.__name__, aggregation
+    try:
+        return aggregation, AGGREGATIONS[aggregation]
+    except KeyError:
+        raise ValueError(f"unknown aggregation '{aggregation}'") from None
+
+
+def _aggregation_ids(spec):
+    """
+    yields the column id, aggregation name, function and result column id of every aggregation in a spec.
+    the result column id is the column id, or a (column id, name) pair when a column has a list of aggregations
+    """
+    for column_id, aggregations in spec.items():
+        if isinstance(aggregations, (list, tuple)):
+            for aggregation in aggregations:
+                name, function = _get_aggregation(aggregation)
+                yield column_id, name, function, (column_id, name)
+        else:
+            name, function = _get_aggregation(aggregations)
+            yield column_id, name, function, column_id
+
+
+class IdIndex:
+    """ordered ids with a hash map from every id to its position"""
+    def __init__(self, ids=()):
+        self.ids = list(ids)
+        self.positions = dict(zip(self.ids, range(len(self.ids))))
+        if len(self.positions) != len(self.ids):
+            raise ValueError("ids must be unique")
+
+    def get(self, data_id, default=None):
+        return self.positions.get(data_id, default)
+
+    def index(self, data_id):
+        try:
+            return self.positions[data_id]
+        except KeyError:
+            raise KeyError(f"The key '{data_id}' does not exist") from None
+
+    def append(self, data_id):
+        if data_id in self.positions:
+            raise ValueError(f"the id '{data_id}' already exists")
+        self.positions[data_id] = len(self.ids)
+        self.ids.append(data_id)
+
+    def extend(self, data_ids):
+        for data_id in data_ids:
+            self.append(data_id)
+
+    def __contains__(self, data_id):
+        return data_id in self.positions
+
+    def __getitem__(self, index):
+        return self.ids[index]
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __eq__(self, other):
+        if isinstance(other, IdIndex):
+            return self.ids == other.ids
+        return self.ids == other
+
+    def __repr__(self):
+        return f"IdIndex({self.ids})"
+
+
+class IdView:
+    """a window of an IdIndex, selected by a range or a list of positions"""
+    def __init__(self, id_index, positions=None):
+        self.id_index = id_index
+        self.positions = range(len(id_index)) if positions is None else positions
+        # built on first use when positions is a list
+        self._view_indexes = None
+
+    @property
+    def ids(self):
+        return list(self)
+
+    def _is_full(self):
+        return self.positions == range(len(self.id_index))
+
+    def _view_index(self, position):
+        """the index of an IdIndex position in this view, None when the view leaves it out"""
+        if isinstance(self.positions, range):
+            if position not in self.positions:
+                return None
+            return self.positions.index(position)
+        if self._view_indexes is None:
+            self._view_indexes = dict(zip(self.positions, range(len(self.positions))))
+        return self._view_indexes.get(position)
+
+    def get(self, data_id, default=None):
+        position = self.id_index.get(data_id)
+        if position is None:
+            return default
+        index = self._view_index(position)
+        return default if index is None else index
+
+    def select(self, positions):
+        """a view of the IdIndex positions that are also in this view, in the order of this view"""
+        indexes = sorted(index for index in map(self._view_index, positions) if index is not None)
+        return IdView(self.id_index, [self.positions[index] for index in indexes])
+
+    def index(self, data_id):
+        position = self.get(data_id)
+        if position is None:
+            raise KeyError(f"The key '{data_id}' does not exist")
+        return position
+
+    def __contains__(self, data_id):
+        return self.get(data_id) is not None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return IdView(self.id_index, self.positions[index])
+        return self.id_index.ids[self.positions[index]]
+
+    def __iter__(self):
+        if self._is_full():
+            return iter(self.id_index.ids)
+        return map(self.id_index.ids.__getitem__, self.positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __eq__(self, other):
+        if isinstance(other, IdView):
+            other = other.ids
+        return self.ids == list(other)
+
+    def __repr__(self):
+        return f"IdView({self.ids})"
+
+
+class ArrayMapping(Mapping):
+    """the rows or columns of a table by id, the TableArray of an id is only built when it is looked up"""
+    def __init__(self, ids, array_at):
+        self.ids = ids
+        self._array_at = array_at
+
+    def __getitem__(self, data_id):
+        return self._array_at(self.ids.index(data_id))
+
+    def __contains__(self, data_id):
+        return data_id in self.ids
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
 
 
 class TableArray:
     def __init__(self, unique_id, data, arrangement, data_ids=None, table=None, default_value=None):
         self.unique_id = unique_id
-        self.data = data
         self.arrangement = arrangement
         self.table = table
         if table is not None and data_ids is not None:
             raise Exception("data ids are ambiguous. Both data_ids and table parameters are assigned.")
         elif table is not None:
             if arrangement is OrderedTable.COLUMN:
-                self.data_ids = table._data_ids[OrderedTable.ROW]
+                data_ids = table.row_ids
             elif arrangement is OrderedTable.ROW:
-                self.data_ids = table._data_ids[OrderedTable.COLUMN]
+                data_ids = table.column_ids
             else:
                 assert False, "arrangement does not exist"
-        elif data_ids is not None:
-            self.data_ids = data_ids
-        else:
-            self.data_ids = range(len(self.data))
-        self._as_dict = dict(zip(self.data_ids, self.data))
+        elif data_ids is None:
+            data_ids = range(len(data))
+        self.data_ids = IdView(IdIndex(data_ids))
         self.default_value = default_value
+        # a standalone array owns a single column store
+        self._store = ColumnStore([make_column(data)])
+        self._position = 0
+        self._along_column = True
+
+    @classmethod
+    def _view(cls, store, unique_id, arrangement, data_ids, position, along_column, table=None, default_value=None):
+        """creates an array that reads its values out of a shared store"""
+        table_array = cls.__new__(cls)
+        table_array.unique_id = unique_id
+        table_array.arrangement = arrangement
+        table_array.table = table
+        table_array.data_ids = data_ids
+        table_array.default_value = default_value
+        table_array._store = store
+        table_array._position = position
+        table_array._along_column = along_column
+        return table_array
+
+    @property
+    def data(self):
+        with instrument.timed("materialise"):
+            if self._along_column:
+                return self._store.column_values(self._position, self.data_ids.positions)
+            return self._store.row_values(self._position, self.data_ids.positions)
+
+    def copy(self):
+        with instrument.timed("copy"):
+            return TableArray(self.unique_id, self.data, self.arrangement, self.data_ids.ids, None,
+                              self.default_value)
+
+    def _get_value(self, index):
+        position = self.data_ids.positions[index]
+        if self._along_column:
+            return self._store.get(position, self._position)
+        return self._store.get(self._position, position)
 
     def _get_id_index(self, data_id):
         """gets index of column, returns None if None"""
-        if data_id in self.data_ids:
-            return self.data_ids.index(data_id)
-        elif data_id is None:
+        if data_id is None:
             return None
-        else:
-            raise KeyError(f"The key '{data_id}' does not exist")
+        return self.data_ids.index(data_id)
 
     def get_slice_section(self, slice_obj):
         start_index = self._get_id_index(slice_obj.start)
@@ -93,18 +397,144 @@ class TableArray:
         return slice(start_index, stop_index, step)
 
     def __getitem__(self, key):
+        if instrument.enabled:
+            instrument.count("slice" if isinstance(key, slice) else "lookup")
         if isinstance(key, slice):
             section = self.get_slice_section(key)
-            data_ids = self.data_ids[section]
-            data = self.data[section]
-            return TableArray(self.unique_id, data, self.arrangement, data_ids, None, self.default_value)
-        elif key in self.data_ids:
-            return self._as_dict[key]
+            return TableArray._view(self._store, self.unique_id, self.arrangement, self.data_ids[section],
+                                    self._position, self._along_column, self.table, self.default_value)
+        return self._get_value(self.data_ids.index(key))
+
+    def _assign(self, values):
+        """writes values over every cell of this array, straight into the store"""
+        if isinstance(values, TableArray):
+            if values.data_ids != self.data_ids:
+                raise ValueError("the data ids of both arrays must match")
+            if values.arrangement is not self.arrangement and values.unique_id != self.unique_id:
+                raise ValueError(f"the unique id '{values.unique_id}' does not match '{self.unique_id}'")
+            values = values.data
+        if self._along_column:
+            self._store.set_column(self._position, self.data_ids.positions, values)
         else:
-            raise KeyError(f"The key '{key}' does not exist")
+            self._store.set_row(self._position, self.data_ids.positions, values)
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            self[key]._assign(value)
+            return
+        position = self.data_ids.positions[self.data_ids.index(key)]
+        if self._along_column:
+            self._store.set(position, self._position, value)
+        else:
+            self._store.set(self._position, position, value)
 
     def __iter__(self):
-        return iter(self.data)
+        if self._along_column:
+            return self._store.iter_column(self._position, self.data_ids.positions)
+        return self._store.iter_row(self._position, self.data_ids.positions)
+
+    def __len__(self):
+        return len(self.data_ids)
+
+    def _memoryview(self):
+        """
+        the values as a memoryview. a packed column read with a range of rows is a read only view of the
+        store's own buffer, any other array is packed into a new buffer first.
+        writes must go through the table, so that its indexes and snapshots see them
+        """
+        rows = self.data_ids.positions
+        if self._along_column and isinstance(self._store, ColumnStore) and isinstance(rows, range):
+            values = self._store.columns[self._position]
+            if typecode(values):
+                return memoryview(values).toreadonly()[as_slice(rows)]
+        values = make_column(self.data)
+        if not typecode(values):
+            raise TypeError("only arrays of all ints or all floats can be exposed as a buffer")
+        return memoryview(values)
+
+    def __buffer__(self, flags):
+        """the buffer protocol, memoryview(table_array) on python 3.12 and later"""
+        return self._memoryview()
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        converts the array for numpy, int and float columns are shared with the store without copying
+        and are read only, pass copy=True for a writable array.
+        while a buffer is shared, appending rows to the table raises BufferError
+        """
+        import numpy
+        try:
+            values = numpy.asarray(self._memoryview())
+        except TypeError:
+            values = numpy.array(self.data, dtype=object)
+        if copy:
+            values = values.copy()
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def _buffer(self):
+        """the values of the array as one buffer, the store's own column when nothing is left out"""
+        if self._along_column:
+            return self._store.column_buffer(self._position, self.data_ids.positions)
+        return self.data
+
+    def aggregate(self, aggregation):
+        """reduces the array with an aggregation name from AGGREGATIONS or a function of a sequence"""
+        return _get_aggregation(aggregation)[1](self._buffer())
+
+    def sum(self):
+        return self.aggregate("sum")
+
+    def mean(self):
+        return self.aggregate("mean")
+
+    def min(self):
+        return self.aggregate("min")
+
+    def max(self):
+        return self.aggregate("max")
+
+    def count(self):
+        return len(self)
+
+
+class GroupBy:
+    """rows of a table grouped by the values of one column, built with OrderedTable.groupby"""
+    def __init__(self, table, column_id):
+        self.table = table
+        self.column_id = column_id
+        values = table[column_id]._buffer()
+        # a dictionary encoded column is grouped by its codes
+        keys = values.codes if isinstance(values, Categorical) else values
+        # hash grouping, groups keep the order their first row has in the table
+        groups = dict()
+        for position, key in enumerate(keys):
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [position]
+            else:
+                group.append(position)
+        if isinstance(values, Categorical):
+            groups = {values.categories[code]: positions for code, positions in groups.items()}
+        self.groups = groups
+
+    def agg(self, spec):
+        """
+        reduces every group, spec maps a column id to an aggregation or a list of them.
+        returns a table with a row per group, its row ids are the group values
+        """
+        # result columns follow the order of the table, as with OrderedTable.agg
+        aggregations = sorted(_aggregation_ids(spec),
+                              key=lambda aggregation: self.table.column_ids.index(aggregation[0]))
+        columns = list()
+        for column_id, _, function, _ in aggregations:
+            values = self.table[column_id]._buffer()
+            code = typecode(values)
+            columns.append([function(array(code, map(values.__getitem__, positions)) if code
+                                     else list(map(values.__getitem__, positions)))
+                            for positions in self.groups.values()])
+        store = ColumnStore([make_column(values) for values in columns], len(self.groups))
+        return OrderedTable._view(store, IdView(IdIndex(result_id for _, _, _, result_id in aggregations)),
+                                  IdView(IdIndex(self.groups)), self.table.default_value)
 
 
 class OrderedTable:
@@ -113,26 +543,60 @@ class OrderedTable:
     def __init__(self, column_ids: list, row_ids: list, data, default_value=None):
         if len(row_ids) != len(data):
             raise ValueError("row ids do not have the same length as data")
-        elif len(column_ids) != len(data[0]):  # assume data has values in it
+        elif data and len(column_ids) != len(data[0]):
             raise ValueError("number of columns in data should match column ids")
         self.default_value = default_value
-        self._data_ids = {OrderedTable.COLUMN: column_ids,
-                          OrderedTable.ROW: row_ids}
-        self._structure = {OrderedTable.COLUMN: dict(),
-                           OrderedTable.ROW: dict()}
-        for i, col_id in enumerate(column_ids):
-            values = [row[i] for row in data]
-            self._structure[OrderedTable.COLUMN][col_id] = TableArray(col_id, values, OrderedTable.COLUMN, table=self, default_value=default_value)
-        for row_number, row_id in enumerate(row_ids):
-            self._structure[OrderedTable.ROW][row_id] = TableArray(row_id, data[row_number], OrderedTable.ROW, table=self, default_value=default_value)
+        self._data_ids = {OrderedTable.COLUMN: IdView(IdIndex(column_ids)),
+                          OrderedTable.ROW: IdView(IdIndex(row_ids))}
+        self._store = ColumnStore.from_rows(data, len(column_ids))
+        # when transposed, rows of the table are read down the columns of the store
+        self._transposed = False
+
+    @classmethod
+    def _view(cls, store, column_ids, row_ids, default_value=None, transposed=False):
+        """creates a table over a shared store, column_ids and row_ids are IdView instances"""
+        table = cls.__new__(cls)
+        table.default_value = default_value
+        table._data_ids = {OrderedTable.COLUMN: column_ids,
+                           OrderedTable.ROW: row_ids}
+        table._store = store
+        table._transposed = transposed
+        return table
+
+    def _row(self, row_index):
+        return TableArray._view(self._store, self.row_ids[row_index], OrderedTable.ROW, self.column_ids,
+                                self.row_ids.positions[row_index], self._transposed, self, self.default_value)
+
+    def _column(self, column_index):
+        return TableArray._view(self._store, self.column_ids[column_index], OrderedTable.COLUMN, self.row_ids,
+                                self.column_ids.positions[column_index], not self._transposed, self,
+                                self.default_value)
+
+    def copy(self):
+        with instrument.timed("copy"):
+            column_ids = IdView(IdIndex(self.column_ids))
+            row_ids = IdView(IdIndex(self.row_ids))
+            if self._transposed:
+                store = ColumnStore.from_columns(self.transposed_data)
+            else:
+                store = self._store.copy(self.row_ids.positions, self.column_ids.positions)
+            return OrderedTable._view(store, column_ids, row_ids, self.default_value)
 
     @property
     def data(self):
-        return [row.data for row in self.rows.values()]
+        with instrument.timed("materialise"):
+            if self._transposed:
+                return [self._store.column_values(column, self.column_ids.positions)
+                        for column in self.row_ids.positions]
+            return self._store.rows(self.row_ids.positions, self.column_ids.positions)
 
     @property
     def transposed_data(self):
-        return[column.data for column in self.columns.values()]
+        with instrument.timed("materialise"):
+            if self._transposed:
+                return self._store.rows(self.column_ids.positions, self.row_ids.positions)
+            return [self._store.column_values(column, self.row_ids.positions)
+                    for column in self.column_ids.positions]
 
     @property
     def row_ids(self):
@@ -144,135 +608,604 @@ class OrderedTable:
 
     @property
     def rows(self):
-        return self._structure[OrderedTable.ROW]
+        return ArrayMapping(self.row_ids, self._row)
 
     @property
     def columns(self):
-        return self._structure[OrderedTable.COLUMN]
+        return ArrayMapping(self.column_ids, self._column)
 
     @staticmethod
-    def extract_csv(filepath, parse_row=None, parse_column=None, parse_data=None, default_value=None):
-        with open(filepath) as rawfile:
-            rawfile = list(csv.reader(rawfile))
-            headings = rawfile[0]
-            del rawfile[0]
-            del headings[0]
-
-            if parse_column:
-                headings = [parse_column(heading) for heading in headings]
-            row_ids = list()
-            if parse_row and parse_data:
-                for row_number, row in enumerate(rawfile):
-                    row_ids.append(parse_row(row[0]))
-                    del rawfile[row_number][0]
-                    for i, value in enumerate(rawfile[row_number]):
-                        rawfile[row_number][i] = parse_data(value)
-            elif parse_row:
-                for row_number, row in enumerate(rawfile):
-                    row_ids.append(parse_row(row[0]))
-                    del rawfile[row_number][0]
-            elif parse_data:
-                for row_number, row in enumerate(rawfile):
-                    row_ids.append(row[0])
-                    del rawfile[row_number][0]
-                    for i, value in enumerate(rawfile[row_number]):
-                        rawfile[row_number][i] = parse_data(value)
+    def _read_csv_heading(reader, parse_column=None, parse_data=None, converters=None, infer_types=False,
+                          usecols=None, where=None):
+        """reads the heading row, returns the kept column ids and the CsvLayout to parse the rows with"""
+        try:
+            headings = next(reader)[1:]
+        except StopIteration:
+            raise ValueError("the csv file is empty") from None
+        if parse_column:
+            headings = [parse_column(heading) for heading in headings]
+        converters = converters or dict()
+        column_parsers = list()
+        for heading in headings:
+            converter = converters.get(heading, parse_data)
+            if converter is None and infer_types:
+                column_parsers.append(infer_column)
             else:
-                for row_number, row in enumerate(rawfile):
-                    row_ids.append(row[0])
-                    del rawfile[row_number][0]
-            return OrderedTable(headings, row_ids, rawfile, default_value)
+                column_parsers.append(partial(convert_column, converter=converter))
+        heading_index = IdIndex(headings)
+        if usecols is None:
+            fields = range(len(headings))
+        else:
+            # columns are kept in the order of the file
+            fields = sorted(heading_index.index(column_id) for column_id in set(usecols))
+        filters = list()
+        for column_id, predicate in (where or dict()).items():
+            field = heading_index.index(column_id)
+            filters.append((field + 1, column_parsers[field], predicate))
+        layout = CsvLayout(len(headings) + 1, [field + 1 for field in fields],
+                           [column_parsers[field] for field in fields], filters)
+        return [headings[field] for field in fields], layout
+
+    @staticmethod
+    def _parse_csv_rows(raw_rows, layout, parse_row=None):
+        """
+        parses a block of raw csv rows one whole column at a time.
+        where filters run first, so only the fields of kept columns in matching rows are converted
+        """
+        for raw_row in raw_rows:
+            if len(raw_row) != layout.width:
+                raise ValueError(f"the row {raw_row[:1]} does not have {layout.width} values")
+        if raw_rows and layout.filters:
+            with instrument.timed("csv.filter"):
+                matches = None
+                for field, parse, predicate in layout.filters:
+                    field_matches = map(bool, map(predicate, parse(list(map(itemgetter(field), raw_rows)))))
+                    matches = list(field_matches if matches is None else map(and_, matches, field_matches))
+                raw_rows = list(compress(raw_rows, matches))
+        if not raw_rows:
+            return list(), [make_column(()) for _ in layout.fields]
+        with instrument.timed("csv.convert"):
+            row_ids = list(map(itemgetter(0), raw_rows))
+            if parse_row:
+                row_ids = list(map(parse_row, row_ids))
+            columns = [parse(list(map(itemgetter(field), raw_rows)))
+                       for field, parse in zip(layout.fields, layout.parsers)]
+        return row_ids, columns
 
+    @staticmethod
+    def iter_csv(filepath, chunk_rows=100000, parse_row=None, parse_column=None, parse_data=None,
+                 default_value=None, converters=None, infer_types=False, usecols=None, where=None):
+        """
+        yields the csv file as OrderedTable instances of at most chunk_rows rows.
+        converters maps column ids to a parser for that column and takes precedence over parse_data.
+        infer_types packs columns without a parser as ints or floats when every value in the chunk parses.
+        usecols lists the column ids to keep, the others are never converted.
+        where maps column ids to a predicate of a parsed value, rows where any predicate is false are dropped
+        before the rest of their fields are converted. chunks can be shorter than chunk_rows or empty.
+        """
+        with open(filepath, newline="") as rawfile:
+            reader = csv.reader(rawfile)
+            column_ids, layout = OrderedTable._read_csv_heading(
+                reader, parse_column, parse_data, converters, infer_types, usecols, where)
+            while True:
+                raw_rows = _read_csv_chunk(reader, chunk_rows)
+                if not raw_rows:
+                    break
+                row_ids, columns = OrderedTable._parse_csv_rows(raw_rows, layout, parse_row)
+                del raw_rows
+                yield OrderedTable._view(ColumnStore(columns, len(row_ids)), IdView(IdIndex(column_ids)),
+                                         IdView(IdIndex(row_ids)), default_value)
 
-    def _get_slice_section(self, slice_obj):
-        start_index = self._get_key_index(slice_obj.start)
-        stop_index = self._get_key_index(slice_obj.stop)
+    @staticmethod
+    def extract_csv(filepath, parse_row=None, parse_column=None, parse_data=None, default_value=None,
+                    converters=None, infer_types=False, chunk_rows=100000, workers=1, usecols=None, where=None):
+        """
+        reads a csv file into an OrderedTable, see iter_csv for the parsing options.
+        with workers above 1 the file is split at line boundaries and parsed in a process pool,
+        parse_row, parse_column, parse_data, converters and where must then be picklable, so no lambdas,
+        and values must not contain quoted line breaks.
+        with infer_types, unlike iter_csv, every column gets one type for the whole file whatever the chunks:
+        a column of ints and floats is read as floats, and a column with any value that is not a number
+        is read as strings, which takes a second pass over the file
+        """
+        if workers > 1:
+            column_ids, row_ids, store, kinds = OrderedTable._extract_csv_parallel(
+                filepath, parse_row, parse_column, parse_data, converters, infer_types, chunk_rows, workers,
+                usecols, where)
+        else:
+            with open(filepath, newline="") as rawfile:
+                reader = csv.reader(rawfile)
+                column_ids, layout = OrderedTable._read_csv_heading(
+                    reader, parse_column, parse_data, converters, infer_types, usecols, where)
+                row_ids, store, kinds = _parse_csv_reader(reader, layout, parse_row, chunk_rows)
+        text_columns = _settle_inferred_types(store, column_ids, kinds)
+        if text_columns:
+            return OrderedTable.extract_csv(filepath, parse_row, parse_column, parse_data, default_value,
+                                            {**(converters or dict()), **text_columns}, infer_types, chunk_rows,
+                                            workers, usecols, where)
+        return OrderedTable._view(store, IdView(IdIndex(column_ids)), IdView(IdIndex(row_ids)), default_value)
+
+    @staticmethod
+    def _extract_csv_parallel(filepath, parse_row, parse_column, parse_data, converters, infer_types, chunk_rows,
+                              workers, usecols=None, where=None):
+        """parses ranges of the file in a process pool, returns the column ids, row ids, store and column kinds"""
+        encoding = locale.getpreferredencoding(False)
+        with open(filepath, "rb") as rawfile:
+            heading = rawfile.readline()
+            start = rawfile.tell()
+            end = os.fstat(rawfile.fileno()).st_size
+            boundaries = [start]
+            for worker in range(1, workers):
+                rawfile.seek(max(start + (end - start) * worker // workers, boundaries[-1]))
+                if rawfile.tell() > start:
+                    # step back one byte so a range that already starts on a line is kept whole
+                    rawfile.seek(rawfile.tell() - 1)
+                rawfile.readline()
+                boundaries.append(min(rawfile.tell(), end))
+            boundaries.append(end)
+        column_ids, layout = OrderedTable._read_csv_heading(
+            csv.reader([heading.decode(encoding)]), parse_column, parse_data, converters, infer_types, usecols, where)
+        ranges = [(range_start, range_stop) for range_start, range_stop in zip(boundaries, boundaries[1:])
+                  if range_stop > range_start]
+        row_ids = list()
+        kinds = [set() for _ in column_ids]
+        if not ranges:
+            return column_ids, row_ids, ColumnStore([make_column(()) for _ in column_ids], 0), kinds
+        store = None
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            results = executor.map(_parse_csv_range, repeat(filepath), *zip(*ranges), repeat(encoding),
+                                   repeat(layout), repeat(parse_row), repeat(chunk_rows))
+            # results come back in the order the ranges were submitted, so rows keep the file order
+            for range_row_ids, range_store, range_kinds in results:
+                row_ids.extend(range_row_ids)
+                for column_kinds, range_column_kinds in zip(kinds, range_kinds):
+                    column_kinds.update(range_column_kinds)
+                if store is None:
+                    store = range_store
+                else:
+                    store.append_columns(range_store.columns, range_store.row_count)
+        return column_ids, row_ids, store, kinds
+
+    @staticmethod
+    def from_chunks(chunks, directory=None, cache_chunks=8, default_value=None):
+        """
+        builds an out of core table from OrderedTable chunks with the same column ids, such as iter_csv yields.
+        every chunk is written to its own file in directory as it arrives, a temporary directory by default,
+        and at most cache_chunks of them are held in memory afterwards. row and column ids stay in memory
+        """
+        column_ids = store = None
+        row_ids = IdIndex()
+        for chunk in chunks:
+            if chunk._transposed or not isinstance(chunk._store, ColumnStore):
+                chunk = chunk.copy()
+            if store is None:
+                column_ids = chunk.column_ids.ids
+                store = ChunkedStore(len(column_ids), directory, cache_chunks)
+            elif chunk.column_ids != column_ids:
+                raise ValueError("every chunk must have the same column ids")
+            row_ids.extend(chunk.row_ids)
+            chunk_store = chunk._store
+            if not (chunk.row_ids._is_full() and chunk.column_ids._is_full()):
+                chunk_store = chunk_store.copy(chunk.row_ids.positions, chunk.column_ids.positions)
+            store.append_columns(chunk_store.columns, chunk_store.row_count)
+        if store is None:
+            raise ValueError("there are no chunks to build a table from")
+        return OrderedTable._view(store, IdView(IdIndex(column_ids)), IdView(row_ids), default_value)
+
+    def spill(self, directory=None, chunk_rows=100000, cache_chunks=8):
+        """returns an out of core copy of the table, split into chunks of chunk_rows rows, see from_chunks"""
+        return OrderedTable.from_chunks(
+            (OrderedTable._view(self._store, self.column_ids, self.row_ids[start:start + chunk_rows],
+                                self.default_value, self._transposed)
+             for start in range(0, max(len(self.row_ids), 1), chunk_rows)),
+            directory, cache_chunks, self.default_value)
+
+    def memory_usage(self, deep=False):
+        """
+        bytes used by the table, broken down by storage, id indexes, value indexes and per array dicts.
+        views share the storage and ids of the table they were taken from, and report all of it.
+        with deep, the values held in lists and dicts are counted too, each object once.
+        an out of core table only counts its resident chunks
+        """
+        seen = set()
+        if isinstance(self._store, ChunkedStore):
+            stores = self._store.resident_chunks()
+        else:
+            stores = [self._store]
+        usage = {"column_ids": sizeof(self.column_ids.id_index, deep, seen),
+                 "row_ids": sizeof(self.row_ids.id_index, deep, seen),
+                 "storage": sum(sizeof(values, deep, seen) for store in stores for values in store.columns),
+                 "indexes": sum(sizeof(index, deep, seen) for index in self._store.indexes.values()),
+                 # row and column arrays are views over the store built on lookup and hold no dicts of
+                 # their own, the key is kept so the breakdown matches Table.memory_usage
+                 "arrays": 0}
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def export_buffers(self):
+        """
+        exports the table as Arrow style columns, see the interchange module.
+        int and float columns of a table whose rows are a range with a step of 1 are shared as read only
+        buffers, not copied
+        """
+        table = self
+        if (self._transposed or not isinstance(self._store, ColumnStore)
+                or not isinstance(self.row_ids.positions, range) or self.row_ids.positions.step != 1):
+            table = self.copy()
+        rows = table.row_ids.positions
+        columns = list()
+        for position in table.column_ids.positions:
+            values = table._store.columns[position]
+            if not ColumnStore._is_full(rows, table._store.row_count):
+                values = memoryview(values)[as_slice(rows)] if typecode(values) else select(values, rows)
+            columns.append(export_column(values))
+        return {"column_ids": table.column_ids.ids, "row_ids": table.row_ids.ids, "length": len(rows),
+                "default_value": table.default_value, "columns": columns}
+
+    @staticmethod
+    def import_buffers(exported):
+        """
+        builds a table from export_buffers output, int and float columns without nulls are not copied.
+        a column shared with a read only buffer is copied the first time the table writes to it
+        """
+        columns = [import_column(column) for column in exported["columns"]]
+        for column in columns:
+            if len(column) != exported["length"]:
+                raise ValueError("every column must have the table's length")
+        store = ColumnStore(columns, exported["length"])
+        return OrderedTable._view(store, IdView(IdIndex(exported["column_ids"])), IdView(IdIndex(exported["row_ids"])),
+                                  exported["default_value"])
+
+    def snapshot(self):
+        """
+        returns a read only view of the table with every committed write, in O(columns) and without copying cells.
+        columns are copied on write while a snapshot shares them, so later writes never show up in it,
+        and threads can read a snapshot without locks while another thread writes to the table.
+        taking a snapshot waits for a single write in progress to finish, but not for a batch
+        """
+        if not isinstance(self._store, ColumnStore):
+            raise TypeError("out of core tables do not support snapshots")
+        return OrderedTable._view(self._store.snapshot(), self.column_ids, self.row_ids, self.default_value,
+                                  self._transposed)
+
+    @contextmanager
+    def batch(self):
+        """
+        groups writes so that snapshots see all of them or none of them.
+        other writers wait for the batch, snapshots taken meanwhile, in any thread, are of the table before it
+        """
+        if not isinstance(self._store, ColumnStore):
+            raise TypeError("out of core tables do not support batches")
+        with self._store.batch():
+            yield self
+
+    def cache_info(self):
+        """hits, misses and evictions of the chunk cache of an out of core table, None for a table in memory"""
+        if isinstance(self._store, ChunkedStore):
+            return self._store.cache_info()
+        return None
+
+    def save(self, filepath):
+        """
+        writes the table to a binary file that load() can map back in without parsing.
+        ids, the default value and columns of objects are pickled, so ids and values other than
+        builtin types, dates and decimals can only be loaded back with trusted=True
+        """
+        table = self
+        if (self._transposed or not (self.row_ids._is_full() and self.column_ids._is_full())
+                or not isinstance(self._store, ColumnStore)):
+            table = self.copy()
+        header = {"column_ids": table.column_ids.ids, "row_ids": table.row_ids.ids,
+                  "default_value": table.default_value}
+        with open(filepath, "wb") as rawfile:
+            write_store(rawfile, table._store, header)
+
+    @staticmethod
+    def load(filepath, mmap=True, trusted=False):
+        """
+        reads a table written by save().
+        with mmap, int and float columns are read straight out of a memory map of the file
+        and only copied when the table is written to.
+        parts of the file are pickled, and unpickling can run arbitrary code. unless trusted, only the
+        value types in columnstore.SAFE_GLOBALS are loaded and anything else raises pickle.UnpicklingError,
+        only pass trusted=True for files from a trusted source
+        """
+        header, store = read_store(filepath, mmap, trusted)
+        return OrderedTable._view(store, IdView(IdIndex(header["column_ids"])), IdView(IdIndex(header["row_ids"])),
+                                  header["default_value"])
+
+    def _get_slice_arrangement(self, slice_obj):
+        """finds whether a slice targets rows or columns, returns None if neither bound is set"""
+        arrangement = None
+        for key in (slice_obj.start, slice_obj.stop):
+            if key is None:
+                continue
+            elif key in self.column_ids:
+                key_arrangement = OrderedTable.COLUMN
+            elif key in self.row_ids:
+                key_arrangement = OrderedTable.ROW
+            else:
+                raise KeyError(f"the key {key} does not exist")
+            if arrangement is not None and arrangement is not key_arrangement:
+                raise KeyError("start and stop slices must be both rows or columns")
+            arrangement = key_arrangement
+        return arrangement
+
+    def _get_slice_section(self, slice_obj, arrangement=None):
+        start_index = self._get_key_index(slice_obj.start, arrangement)
+        stop_index = self._get_key_index(slice_obj.stop, arrangement)
         step = slice_obj.step
         if not isinstance(step, int) and step is not None:
             raise TypeError("step must be None or of type 'int'")
         return slice(start_index, stop_index, step)
 
-    def _get_key_index(self, key):
-        if key in self.column_ids:
-            return self.column_ids.index(key)
-        elif key in self.row_ids:
-            return self.row_ids.index(key)
-        elif key is None:
+    def _get_key_index(self, key, arrangement=None):
+        if key is None:
             return None
-        else:
-            raise KeyError(f"the key {key} does not exist")
+        if arrangement is not OrderedTable.ROW:
+            index = self.column_ids.get(key)
+            if index is not None:
+                return index
+        if arrangement is not OrderedTable.COLUMN:
+            index = self.row_ids.get(key)
+            if index is not None:
+                return index
+        raise KeyError(f"the key {key} does not exist")
 
     def __getitem__(self, key):
+        if instrument.enabled:
+            instrument.count("slice" if isinstance(key, slice) else "lookup")
         if isinstance(key, slice):
-            if key.start in self.column_ids and key.stop in self.row_ids or \
-                key.start in self.row_ids and key.stop in self.column_ids:
-                raise KeyError("start and stop slices must be both rows or columns")
-            section = self._get_slice_section(key)
-            if key.start is None and key.stop is None:
+            arrangement = self._get_slice_arrangement(key)
+            if arrangement is None:
                 if key.step is None:
-                    return OrderedTable(self.column_ids, self.row_ids, self.data, self.default_value)
+                    return OrderedTable._view(self._store, self.column_ids, self.row_ids, self.default_value,
+                                              self._transposed)
                 else:
                     raise KeyError("step is defined without targeting rows or columns")
-            elif key.start in self.column_ids or key.stop in self.column_ids:
-                data = list()
-                for row in self.data:
-                    data.append(row[section])
-                column_ids = self.column_ids[section]
-                return OrderedTable(column_ids, self.row_ids, data, self.default_value)
-            elif key.start in self.row_ids or key.stop in self.row_ids:
-                data = self.data[section]
-                row_ids = self.row_ids[section]
-                return OrderedTable(self.column_ids, row_ids, data, self.default_value)
-            assert False, "slice start, stop, and step not accounted for"
-        elif key in self.column_ids:
-            return self.columns[key]
-        elif key in self.row_ids:
-            return self.rows[key]
-        else:
-            raise KeyError(f"The key '{key}' does not exist")
-
-    def transpose(self):
-        return OrderedTable(self.row_ids, self.column_ids, self.transposed_data, self.default_value)
-
-    def _split_row_ids(self, other):
-        other_only_row_ids = list()
-        matching_row_ids = list()
-        for row_id in other.row_ids:
-            if row_id in self.row_ids:
-                matching_row_ids.append(row_id)
+            section = self._get_slice_section(key, arrangement)
+            if arrangement is OrderedTable.COLUMN:
+                return OrderedTable._view(self._store, self.column_ids[section], self.row_ids, self.default_value,
+                                          self._transposed)
             else:
-                other_only_row_ids.append(row_id)
-        return other_only_row_ids, matching_row_ids
+                return OrderedTable._view(self._store, self.column_ids, self.row_ids[section], self.default_value,
+                                          self._transposed)
+        index = self.column_ids.get(key)
+        if index is not None:
+            return self._column(index)
+        index = self.row_ids.get(key)
+        if index is not None:
+            return self._row(index)
+        raise KeyError(f"The key '{key}' does not exist")
 
-    def _has_conflicting_data(self, other, matching_column_ids, matching_row_ids):
-        if matching_column_ids == [] or matching_row_ids == []:
-            return False, None, None
+    def _assign(self, values, arrangement=None):
+        """
+        writes values over every cell of this table, straight into the store.
+        values is an OrderedTable with the same ids, or nested arrays that are rows,
+        or columns when arrangement is COLUMN
+        """
+        if isinstance(values, OrderedTable):
+            if values.row_ids != self.row_ids or values.column_ids != self.column_ids:
+                raise ValueError("row ids and column ids of both tables must match")
+            columns = values.transposed_data
+        elif arrangement is OrderedTable.COLUMN:
+            columns = values
         else:
-            for row_id, column_id in zip(matching_row_ids, matching_column_ids):
-                if self[row_id][column_id] != other[row_id][column_id]:
-                    return True, row_id, column_id
-            return False, None, None
+            rows = list(values)
+            if len(rows) != len(self.row_ids):
+                raise ValueError(f"expected {len(self.row_ids)} rows, got {len(rows)}")
+            for row in rows:
+                if len(row) != len(self.column_ids):
+                    raise ValueError(f"expected {len(self.column_ids)} values in every row, got {len(row)}")
+            columns = list(zip(*rows)) if rows else [()] * len(self.column_ids)
+        columns = list(columns)
+        if len(columns) != len(self.column_ids):
+            raise ValueError(f"expected {len(self.column_ids)} columns, got {len(columns)}")
+        for column_index, column in enumerate(columns):
+            self._column(column_index)._assign(column)
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            self[key]._assign(value, self._get_slice_arrangement(key))
+        else:
+            self[key]._assign(value)
+
+    def agg(self, spec):
+        """
+        reduces columns, spec maps a column id to an aggregation or a list of them.
+        returns a table with a row per aggregation, cells without an aggregation get default_value
+        """
+        results = dict()
+        row_ids = IdIndex()
+        for column_id, name, function, _ in _aggregation_ids(spec):
+            if name not in row_ids:
+                row_ids.append(name)
+            results[name, column_id] = self[column_id].aggregate(function)
+        column_ids = [column_id for column_id in self.column_ids if column_id in spec]
+        data = [[results.get((row_id, column_id), self.default_value) for column_id in column_ids]
+                for row_id in row_ids]
+        return OrderedTable(column_ids, row_ids.ids, data, self.default_value)
+
+    def groupby(self, column_id):
+        """groups rows by the values of a column, see GroupBy.agg"""
+        return GroupBy(self, column_id)
+
+    def create_index(self, column_id, kind="hash"):
+        """
+        indexes the values of a column, kind is "hash" for equality lookups or "sorted" for range lookups too.
+        the index belongs to the store, so every view of it uses and updates the same index
+        """
+        if self._transposed:
+            raise ValueError("columns of a transposed table can not be indexed, copy() it first")
+        self._store.create_index(self.column_ids.positions[self.column_ids.index(column_id)], kind)
 
-    def _split_column_ids(self, other):
-        other_only_column_ids = list()
-        matching_column_ids = list()
-        for column_id in other.column_ids:
-            if column_id in self.column_ids:
-                matching_column_ids.append(column_id)
+    def where(self, column_id, equals=NOT_GIVEN, between=None):
+        """
+        returns a view of the rows whose value in a column equals a value, or is in an inclusive (low, high) range.
+        equals=None finds the cells that hold None, such as the default cells of a merge.
+        uses the column's index when it has one that can answer the query and scans the column otherwise
+        """
+        if (equals is NOT_GIVEN) == (between is None):
+            raise ValueError("exactly one of equals and between must be given")
+        column = self.column_ids.index(column_id)
+        index = None if self._transposed else self._store.indexes.get(self.column_ids.positions[column])
+        if index is not None and between is not None and not index.ranges:
+            # a hash index can not answer range queries, the column is scanned instead
+            index = None
+        if index is not None:
+            try:
+                rows = index.equals(equals) if between is None else index.between(*between)
+            except TypeError:
+                # the value does not compare with the values of a sorted index, so no row holds it
+                rows = list()
+            row_ids = self.row_ids.select(rows)
+        else:
+            if between is None:
+                values = self._column(column)._buffer()
+                if isinstance(values, Categorical):
+                    matches = values.matches(equals)
+                else:
+                    matches = map(partial(eq, equals), values)
             else:
-                other_only_column_ids.append(column_id)
-        return other_only_column_ids, matching_column_ids
+                low, high = between
+                # like a sorted index, the range skips cells that hold None
+                matches = (value is not None and low <= value <= high for value in self._column(column))
+            row_ids = IdView(self.row_ids.id_index, list(compress(self.row_ids.positions, matches)))
+        return OrderedTable._view(self._store, self.column_ids, row_ids, self.default_value, self._transposed)
+
+    def transpose(self):
+        """swaps rows and columns without moving any cells, use copy() to lay the result out as columns"""
+        return OrderedTable._view(self._store, self.row_ids, self.column_ids, self.default_value,
+                                  not self._transposed)
+
+    def _split_ids(self, other, arrangement):
+        """
+        lays out the ids of both tables along one axis, ids of self first.
+        returns the merged ids and the merged position of every id of other
+        """
+        merged_ids = IdIndex(self._data_ids[arrangement])
+        merged_ids.extend(data_id for data_id in other._data_ids[arrangement] if data_id not in merged_ids)
+        return merged_ids, [merged_ids.positions[data_id] for data_id in other._data_ids[arrangement]]
+
+    def _has_conflicting_data(self, other, other_row_positions, other_column_positions):
+        """compares every cell both tables hold, returns the first pair of ids that differ"""
+        matching_rows = [(position, other_position) for other_position, position in enumerate(other_row_positions)
+                         if position < len(self.row_ids)]
+        if not matching_rows:
+            return False, None, None
+        positions, other_positions = zip(*matching_rows)
+        for other_column, column in enumerate(other_column_positions):
+            if column >= len(self.column_ids):
+                continue
+            values = list(map(self._column(column).data.__getitem__, positions))
+            other_values = list(map(other._column(other_column).data.__getitem__, other_positions))
+            if values == other_values:
+                continue
+            for position, value, other_value in zip(positions, values, other_values):
+                if (value != other_value and not _is_nan_pair(value, other_value)
+                        and not _is_placeholder(value, self.default_value)
+                        and not _is_placeholder(other_value, other.default_value)):
+                    return True, self.row_ids[position], self.column_ids[column]
+        return False, None, None
 
     def _merge_data(self, other):
-        other_only_column_ids, matching_column_ids = self._split_column_ids(other)
-        other_only_row_ids, matching_row_ids = self._split_row_ids(other)
-        has_conflicts, row_id, column_id = self._has_conflicting_data(other, matching_column_ids, matching_row_ids)
+        """builds the columns of self + other, every merged column is allocated once"""
+        row_ids, other_row_positions = self._split_ids(other, OrderedTable.ROW)
+        column_ids, other_column_positions = self._split_ids(other, OrderedTable.COLUMN)
+        has_conflicts, row_id, column_id = self._has_conflicting_data(other, other_row_positions,
+                                                                      other_column_positions)
         if has_conflicts:
             raise ValueError(f"can not add tables with conflicting values at {row_id} and {column_id}")
 
-        merged_data = self.data
-        for row_id, column_id in zip(matching_row_ids, matching_column_ids):
-            pass
+        other_columns = dict(zip(other_column_positions, range(len(other_column_positions))))
+        other_rows = _as_range(other_row_positions)
+        added_rows = len(row_ids) - len(self.row_ids)
+        columns = list()
+        for column in range(len(column_ids)):
+            if column < len(self.column_ids):
+                values = self._column(column).data
+                values.extend([self.default_value] * added_rows)
+            else:
+                values = [self.default_value] * len(row_ids)
+            if column in other_columns:
+                other_values = other._column(other_columns[column]).data
+                if column < len(self.column_ids):
+                    # the default cells of other are placeholders and leave the cells of self as they are
+                    other_values = [values[position] if _is_placeholder(value, other.default_value) else value
+                                    for position, value in zip(other_rows, other_values)]
+                if isinstance(other_rows, range):
+                    values[other_rows.start:other_rows.stop] = other_values
+                else:
+                    for position, value in zip(other_rows, other_values):
+                        values[position] = value
+            columns.append(make_column(values))
+        return column_ids, row_ids, ColumnStore(columns, len(row_ids))
+
+    def __add__(self, other):
+        """merges two tables, cells neither table holds are set to default_value"""
+        if not isinstance(other, OrderedTable):
+            return NotImplemented
+        with instrument.timed("merge"):
+            column_ids, row_ids, store = self._merge_data(other)
+            self._merge_indexes(store)
+        return OrderedTable._view(store, IdView(column_ids), IdView(row_ids), self.default_value)
+
+    def _merge_indexes(self, store):
+        """
+        carries the indexes of self over to a merged store, only the rows merged in are added.
+        an index that can not hold a merged value, such as a default_value that does not compare
+        with the values of a sorted index, is left behind and the merged column is scanned instead
+        """
+        if self._transposed or not self.row_ids._is_full():
+            return
+        for column, index in self._store.indexes.items():
+            merged_column = self.column_ids._view_index(column)
+            if merged_column is None:
+                continue
+            merged_index = index.copy()
+            rows = range(len(self.row_ids), store.row_count)
+            try:
+                add_rows(merged_index, rows, select(store.columns[merged_column], rows))
+            except TypeError:
+                continue
+            store.indexes[merged_column] = merged_index
+
+    def __sub__(self, other):
+        """
+        removes the cells of other. rows of other that span every column and columns of other that
+        span every row are dropped, any other cells of other are set to default_value
+        """
+        if not isinstance(other, OrderedTable):
+            return NotImplemented
+        row_positions = [self.row_ids.index(row_id) for row_id in other.row_ids]
+        column_positions = [self.column_ids.index(column_id) for column_id in other.column_ids]
+        removed_rows = set(row_positions)
+        removed_columns = set(column_positions)
+        kept_rows = range(len(self.row_ids))
+        kept_columns = range(len(self.column_ids))
+        if len(removed_columns) == len(self.column_ids):
+            kept_rows = [row for row in kept_rows if row not in removed_rows]
+        elif len(removed_rows) == len(self.row_ids):
+            kept_columns = [column for column in kept_columns if column not in removed_columns]
+        else:
+            kept_rows = kept_columns = None
+        if kept_rows is not None:
+            columns = list()
+            for column in kept_columns:
+                values = self._column(column).data
+                columns.append(make_column(map(values.__getitem__, kept_rows)))
+            return OrderedTable._view(ColumnStore(columns, len(kept_rows)),
+                                      IdView(IdIndex(map(self.column_ids.__getitem__, kept_columns))),
+                                      IdView(IdIndex(map(self.row_ids.__getitem__, kept_rows))), self.default_value)
+        columns = list()
+        for column in range(len(self.column_ids)):
+            values = self._column(column).data
+            if column in removed_columns:
+                for row in removed_rows:
+                    values[row] = self.default_value
+            columns.append(make_column(values))
+        return OrderedTable._view(ColumnStore(columns, len(self.row_ids)), IdView(IdIndex(self.column_ids)),
+                                  IdView(IdIndex(self.row_ids)), self.default_value)
 
     """def __repr__(self):
         s = "\t"
@@ -315,8 +1248,6 @@ def test():
     print(t["d"]["3 Mo":])
     print(t["Date"]["d":])
 
-tt = Timer()
-table = OrderedTable.extract_csv("test.csv", parse_data=int)
-print(table["organization"])
-print(tab)
-print (f"{Timer()-tt} seconds")
+
+if __name__ == "__main__":
+    test()
@@ -1,3 +1,7 @@
+import instrument
+from instrument import sizeof
+
+
 class TableArray:
     def __init__(self, unique_id, data, arrangement, data_ids=None, default_value=None):
         self.unique_id = unique_id
@@ -11,6 +15,8 @@ class TableArray:
         self.default_value = default_value
 
     def __getitem__(self, key):
+        if instrument.enabled:
+            instrument.count("lookup")
         if key in self.data_ids:
             return self._as_dict[key]
         else:
@@ -61,6 +67,8 @@ class Table:
         return self._structure[Table.COLUMN]
 
     def __getitem__(self, key) -> TableArray:
+        if instrument.enabled:
+            instrument.count("lookup")
         if key in self.column_ids:
             return self.columns[key]
         elif key in self.row_ids:
@@ -68,6 +76,23 @@ class Table:
         else:
             raise KeyError(f"The key '{key}' does not exist")
 
+    def memory_usage(self, deep=False):
+        """
+        bytes used by the table, broken down by the cells every row and column array holds,
+        the id sets, and the dicts and id sets of every array.
+        with deep, the values held in lists and dicts are counted too, each object once
+        """
+        seen = set()
+        table_arrays = [table_array for structure in self._structure.values() for table_array in structure.values()]
+        usage = {"column_ids": sizeof(self.column_ids, deep, seen),
+                 "row_ids": sizeof(self.row_ids, deep, seen),
+                 "storage": sum(sizeof(table_array.data, deep, seen) for table_array in table_arrays),
+                 "indexes": 0,
+                 "arrays": sum(sizeof(table_array._as_dict, deep, seen) + sizeof(table_array.data_ids, deep, seen)
+                               for table_array in table_arrays)}
+        usage["total"] = sum(usage.values())
+        return usage
+
     def __repr__(self):
         s = "\t"
         for c in self.column_ids:
@@ -98,4 +123,5 @@ def test():
     for c in bc:
         print(t[c])
 
-test()
\ No newline at end of file
+if __name__ == "__main__":
+    test()
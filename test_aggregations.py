@@ -0,0 +1,20 @@
+
+
+
+def test_aggregations_and_groupby(table):
+    assert table["a"].sum() == 35
+    assert table["b"].mean() == 3.0
+    assert table["a"]["x":].max() == 20
+    aggregated = table.agg({"a": "sum", "b": ["min", "max"]})
+    assert aggregated.row_ids == ["sum", "min", "max"]
+    assert aggregated["sum"]["a"] == 35
+    assert aggregated["max"]["b"] == 4.5
+    grouped = table.groupby("c").agg({"a": "sum"})
+    assert grouped.row_ids == ["p", "q", "r"]
+    assert grouped["a"].data == [10, 5, 20]
+
+
+def test_groupby_columns_follow_the_table(table):
+    grouped = table.groupby("c").agg({"b": ["max", "min"], "a": "sum"})
+    assert grouped.column_ids == ["a", ("b", "max"), ("b", "min")]
+    assert grouped["p"].data == [10, 3.5, 1.5]
@@ -0,0 +1,64 @@
+import pytest
+
+from columnstore import Categorical, ColumnStore
+from orderedtable import OrderedTable
+
+
+def test_categorical_column_with_a_hash_index_takes_unhashable_values():
+    row_ids = [f"r{i}" for i in range(40)]
+    table = OrderedTable(["c"], row_ids, [["pq"[i % 2]] for i in range(40)])
+    assert isinstance(table._store.columns[0], Categorical)
+    table.create_index("c")
+    table["r1"]["c"] = ["p", "q"]
+    assert isinstance(table._store.columns[0], list)
+    assert table.where("c", equals=["p", "q"]).row_ids == ["r1"]
+    assert table.where("c", equals="q").row_ids == row_ids[3::2]
+    table["r1"]["c"] = "q"
+    assert table.where("c", equals="q").row_ids == row_ids[1::2]
+
+
+def test_categorical_column_with_a_sorted_index_rejects_unorderable_values():
+    row_ids = [f"r{i}" for i in range(40)]
+    table = OrderedTable(["c"], row_ids, [["pq"[i % 2]] for i in range(40)])
+    table.create_index("c", "sorted")
+    with pytest.raises(TypeError):
+        table["r1"]["c"] = ["p", "q"]
+    assert isinstance(table._store.columns[0], Categorical)
+    assert table["r1"]["c"] == "q"
+    assert table.where("c", between=("q", "q")).row_ids == row_ids[1::2]
+
+
+def repeated_keys(first, stop, repeat=2):
+    return [f"k{i}" for i in range(first, stop) for _ in range(repeat)]
+
+
+@pytest.mark.parametrize("categories", [257, 65537])
+def test_codes_widen_when_a_column_is_built(categories):
+    values = repeated_keys(0, categories)
+    table = OrderedTable(["c"], range(len(values)), [[value] for value in values])
+    column = table._store.columns[0]
+    assert isinstance(column, Categorical)
+    assert column.codes.typecode == ("H" if categories < 65536 else "q")
+    assert table["c"].data == values
+
+
+@pytest.mark.parametrize("categories", [257, 65537])
+def test_codes_widen_when_chunks_are_appended(categories):
+    half = categories // 2
+    first, second = repeated_keys(0, half), repeated_keys(half, categories)
+    column = Categorical.encode(first)
+    column.extend(Categorical.encode(second))
+    assert list(column) == first + second
+    store = ColumnStore([Categorical.encode(first)])
+    store.append_columns([Categorical.encode(second)])
+    assert list(store.columns[0]) == first + second
+
+
+def test_csv_chunks_with_more_than_256_categories(tmp_path):
+    values = repeated_keys(0, 200) + repeated_keys(200, 400)
+    path = tmp_path / "t.csv"
+    path.write_text("id,c\n" + "".join(f"r{i},{value}\n" for i, value in enumerate(values)))
+    for chunk_rows in (400, 1000):
+        table = OrderedTable.extract_csv(path, chunk_rows=chunk_rows)
+        assert isinstance(table._store.columns[0], Categorical)
+        assert table["c"].data == values
@@ -0,0 +1,68 @@
+from functools import partial
+from operator import le
+
+import pytest
+
+from columnstore import typecode
+from orderedtable import OrderedTable
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as rawfile:
+        rawfile.write("id,a,b,c\n")
+        for i in range(rows):
+            rawfile.write(f"r{i},{i},{i / 2},{'pq'[i % 2]}\n")
+    return path
+
+
+def read_csv_ways(path, **options):
+    yield "serial", OrderedTable.extract_csv(path, **options)
+    yield "chunked", OrderedTable.extract_csv(path, chunk_rows=7, **options)
+    yield "parallel", OrderedTable.extract_csv(path, chunk_rows=7, workers=3, **options)
+    chunks = list(OrderedTable.iter_csv(path, chunk_rows=7, **options))
+    yield "iter", OrderedTable.from_chunks(chunks).copy()
+
+
+def test_csv_paths_read_the_same_table(tmp_path):
+    path = write_csv(tmp_path / "t.csv", 50)
+    for way, table in read_csv_ways(path, infer_types=True):
+        assert table.column_ids == ["a", "b", "c"], way
+        assert table.row_ids == [f"r{i}" for i in range(50)], way
+        assert table["r7"].data == [7, 3.5, "q"], way
+        assert table["a"].sum() == sum(range(50)), way
+
+
+def test_csv_usecols_and_where(tmp_path):
+    path = write_csv(tmp_path / "t.csv", 50)
+    options = dict(converters={"a": int}, usecols=["c", "a"], where={"a": partial(le, 45)})
+    for way, table in read_csv_ways(path, **options):
+        assert table.column_ids == ["a", "c"], way
+        assert table.row_ids == ["r45", "r46", "r47", "r48", "r49"], way
+        assert table["a"].data == [45, 46, 47, 48, 49], way
+        assert table["c"].data == ["q", "p", "q", "p", "q"], way
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_columns_stay_packed_when_where_drops_the_first_chunk(workers, tmp_path):
+    path = write_csv(tmp_path / "t.csv", 200)
+    table = OrderedTable.extract_csv(path, infer_types=True, chunk_rows=50, workers=workers,
+                                     where={"a": partial(le, 120)})
+    assert table.row_ids == [f"r{i}" for i in range(120, 200)]
+    assert table["a"].data == list(range(120, 200))
+    assert [typecode(values) for values in table._store.columns[:2]] == ["q", "d"]
+
+
+def write_column(path, values):
+    path.write_text("id,a\n" + "".join(f"r{i},{value}\n" for i, value in enumerate(values)))
+    return path
+
+
+@pytest.mark.parametrize("chunk_rows, workers", [(5, 1), (100, 1), (5, 2), (100, 2)])
+def test_inferred_types_do_not_depend_on_chunks(chunk_rows, workers, tmp_path):
+    numbers_then_text = write_column(tmp_path / "text.csv", ["007"] + list(range(1, 10)) + ["x"])
+    table = OrderedTable.extract_csv(numbers_then_text, infer_types=True, chunk_rows=chunk_rows, workers=workers)
+    assert table["a"].data == ["007"] + [str(i) for i in range(1, 10)] + ["x"]
+    ints_then_floats = write_column(tmp_path / "floats.csv", list(range(10)) + [0.5])
+    table = OrderedTable.extract_csv(ints_then_floats, infer_types=True, chunk_rows=chunk_rows, workers=workers)
+    assert table["a"].data == [float(i) for i in range(10)] + [0.5]
+    assert typecode(table._store.columns[0]) == "d"
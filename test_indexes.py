@@ -0,0 +1,120 @@
+import math
+
+import pytest
+
+from orderedtable import OrderedTable
+
+
+@pytest.mark.parametrize("kind", ["hash", "sorted"])
+def test_index_is_kept_when_merging_in_default_cells(kind, table):
+    table.create_index("a", kind)
+    merged = table + OrderedTable(["b"], ["v"], [[5.5]])
+    assert merged["v"]["a"] is None
+    assert merged.where("a", equals=5).row_ids == ["x"]
+    assert merged.where("a", equals=None).row_ids == ["v"]
+    if kind == "sorted":
+        assert merged.where("a", between=(0, 10)).row_ids == ["w", "x", "y"]
+
+
+def test_merge_leaves_behind_an_index_that_can_not_hold_the_default():
+    table = OrderedTable(["a", "b"], ["x", "y"], [[1, 2], [3, 4]], default_value="missing")
+    table.create_index("a", "sorted")
+    merged = table + OrderedTable(["b"], ["z"], [[5]])
+    assert merged._store.indexes == {}
+    assert merged.where("a", equals=3).row_ids == ["y"]
+    assert merged.where("a", equals="missing").row_ids == ["z"]
+    assert table.where("a", between=(0, 10)).row_ids == ["x", "y"]
+
+
+@pytest.mark.parametrize("kind", ["hash", "sorted"])
+def test_index_follows_none_written_to_a_cell(kind, table):
+    table.create_index("a", kind)
+    table["x"]["a"] = None
+    assert table.where("a", equals=None).row_ids == ["x"]
+    table["x"]["a"] = 6
+    assert table.where("a", equals=6).row_ids == ["x"]
+    if kind == "sorted":
+        assert table.where("a", between=(0, 10)).row_ids == ["w", "x", "y"]
+
+
+def test_failed_write_leaves_the_cell_and_index_unchanged(table):
+    table.create_index("a", "sorted")
+    with pytest.raises(TypeError):
+        table["x"]["a"] = "five"
+    with pytest.raises(TypeError):
+        table["a"] = [0, 1, "two", 3]
+    with pytest.raises(TypeError):
+        table["x"] = [[], 0.0, "s"]
+    assert table["a"].data == [1, 5, 9, 20]
+    assert table["x"].data == [5, 2.5, "q"]
+    assert table.where("a", between=(0, 10)).row_ids == ["w", "x", "y"]
+
+
+def test_failed_append_leaves_every_index_unchanged(table):
+    table.create_index("a", "hash")
+    table.create_index("b", "sorted")
+    with pytest.raises(TypeError):
+        table._store.append_columns([[30], ["not a float"], ["s"]])
+    assert table._store.indexes[0].equals(30) == []
+    assert table.where("b", between=(0, 10)).row_ids == ["w", "x", "y", "z"]
+
+
+def test_hash_index_holds_unhashable_and_nan_values(table):
+    table.create_index("b", "hash")
+    table["x"]["b"] = math.nan
+    assert table.where("b", equals=math.nan).row_ids == []
+    table["x"]["b"] = 2.5
+    assert table.where("b", equals=2.5).row_ids == ["x"]
+    table["y"]["b"] = [1, 2]
+    assert table.where("b", equals=[1, 2]).row_ids == ["y"]
+    table["y"]["b"] = 3.5
+    assert table.where("b", equals=3.5).row_ids == ["y"]
+    assert table.where("b", equals=[1, 2]).row_ids == []
+
+
+def test_sorted_index_skips_nan(table):
+    table.create_index("b", "sorted")
+    table["x"]["b"] = math.nan
+    assert table.where("b", between=(0, 10)).row_ids == ["w", "y", "z"]
+    table["x"]["b"] = 2.0
+    assert table.where("b", between=(0, 10)).row_ids == ["w", "x", "y", "z"]
+
+
+@pytest.mark.parametrize("kind", ["hash", "sorted"])
+def test_out_of_core_index_follows_writes(kind, tmp_path, table):
+    table = table.spill(tmp_path, chunk_rows=2, cache_chunks=1)
+    table.create_index("a", kind)
+    table["a"]["x":"z"] = [None, 7]
+    assert table.where("a", equals=None).row_ids == ["x"]
+    assert table.where("a", equals=7).row_ids == ["y"]
+
+
+def test_sorted_index_takes_many_rows_at_once():
+    values = [(i * 7919) % 101 for i in range(300)]
+    table = OrderedTable(["a"], range(300), [[value] for value in values])
+    table.create_index("a", "sorted")
+    added = [None if i % 10 == 0 else (i * 31) % 101 for i in range(200)]
+    merged = table + OrderedTable(["a"], range(300, 500), [[value] for value in added])
+    expected = [row for row, value in enumerate(values + added) if value is not None and 20 <= value <= 40]
+    assert merged.where("a", between=(20, 40)).row_ids == expected
+    assert merged.where("a", equals=None).row_ids == list(range(300, 500, 10))
+    merged["a"][100:400] = [value + 1 for value in range(300)]
+    column = merged["a"].data
+    expected = [row for row, value in enumerate(column) if value is not None and 20 <= value <= 40]
+    assert merged.where("a", between=(20, 40)).row_ids == expected
+    with pytest.raises(TypeError):
+        merged["a"][0:300] = ["text"] * 300
+    assert merged.where("a", between=(20, 40)).row_ids == expected
+
+
+def test_where_scans_when_a_hash_index_can_not_answer_a_range(table):
+    table.create_index("a", "hash")
+    assert table.where("a", between=(2, 10)).row_ids == ["x", "y"]
+    assert table.where("a", equals=9).row_ids == ["y"]
+
+
+def test_where_finds_nothing_for_a_value_a_sorted_index_can_not_order(table):
+    table.create_index("b", "sorted")
+    assert table.where("b", equals="s").row_ids == []
+    assert table.where("b", between=("a", "z")).row_ids == []
+    assert table.where("b", equals=2.5).row_ids == ["x"]
@@ -0,0 +1,55 @@
+import instrument
+from instrument import Profile
+from orderedtable import OrderedTable
+
+
+def test_profile_counts_lookups_slices_and_copies(table):
+    with Profile() as profile:
+        table["x"]["a"]
+        table["w":"y"].data
+        table.copy()
+    assert profile.counts["lookup"] == 2
+    assert profile.counts["slice"] == 1
+    assert profile.counts["materialise"] == 1
+    assert profile.counts["copy"] == 1
+    assert profile.seconds["materialise"] > 0
+    assert profile.seconds["copy"] > 0
+    assert "slice" not in profile.seconds
+    assert not instrument.enabled
+
+
+def test_profile_times_csv_stages(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text("id,a\nx,1\ny,2\n")
+    with Profile() as profile:
+        OrderedTable.extract_csv(path, parse_data=int)
+    assert profile.counts["csv.read"] >= 1
+    assert profile.seconds["csv.convert"] > 0
+    assert set(profile.report()) == {"counts", "seconds"}
+
+
+def test_hooks_receive_events_until_removed(table):
+    events = list()
+
+    def hook(event, number, seconds):
+        events.append((event, number, seconds))
+
+    instrument.add_hook(hook)
+    try:
+        table["x"]
+    finally:
+        instrument.remove_hook(hook)
+    table["y"]
+    assert events == [("lookup", 1, None)]
+    assert not instrument.enabled
+
+
+def test_memory_usage_breaks_down_the_table(table):
+    usage = table.memory_usage()
+    assert set(usage) == {"column_ids", "row_ids", "storage", "indexes", "arrays", "total"}
+    assert usage["total"] == sum(value for key, value in usage.items() if key != "total")
+    assert usage["storage"] > 0
+    assert usage["indexes"] == 0
+    table.create_index("a")
+    assert table.memory_usage()["indexes"] > 0
+    assert table.memory_usage(deep=True)["total"] > table.memory_usage()["total"]
@@ -0,0 +1,37 @@
+import pytest
+
+from orderedtable import OrderedTable
+
+
+def test_add_merges_rows_and_columns_with_default_cells(table):
+    merged = table + OrderedTable(["d"], ["w", "v"], [[1], [2]])
+    assert merged.column_ids == ["a", "b", "c", "d"]
+    assert merged.row_ids == ["w", "x", "y", "z", "v"]
+    assert merged["w"].data == [1, 1.5, "p", 1]
+    assert merged["x"]["d"] is None
+    assert merged["v"].data == [None, None, None, 2]
+    assert (table + table["x":"z"]).data == table.data
+    with pytest.raises(ValueError):
+        table + OrderedTable(["a"], ["w"], [[999]])
+
+
+def test_sub_drops_whole_rows_and_columns_and_clears_other_cells(table):
+    assert (table - OrderedTable(["a", "b", "c"], ["x"], [[0, 0, 0]])).row_ids == ["w", "y", "z"]
+    assert (table - OrderedTable(["c"], ["w", "x", "y", "z"], [[0]] * 4)).column_ids == ["a", "b"]
+    cleared = table - OrderedTable(["c"], ["x"], [[0]])
+    assert cleared["c"].data == ["p", None, "p", "r"]
+    assert table["c"].data == ["p", "q", "p", "r"]
+
+
+def test_add_fills_default_cells_of_an_earlier_merge(table):
+    merged = table + OrderedTable(["d"], ["v"], [[1]])
+    merged = merged + OrderedTable(["a", "d"], ["v", "w"], [[7, 1], [1, None]])
+    assert merged["v"].data == [7, None, None, 1]
+    assert merged["w"].data == [1, 1.5, "p", None]
+
+
+def test_add_treats_nan_cells_as_equal():
+    table = OrderedTable(["a"], ["x", "y"], [[float("nan")], [2.0]])
+    merged = table + table
+    assert merged.row_ids == ["x", "y"]
+    assert merged["y"]["a"] == 2.0
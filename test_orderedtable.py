@@ -0,0 +1,41 @@
+import pytest
+
+from columnstore import typecode
+from orderedtable import OrderedTable
+
+
+def test_int_and_float_columns_are_packed(table):
+    assert [typecode(values) for values in table._store.columns] == ["q", "d", None]
+    assert table.data == [[1, 1.5, "p"], [5, 2.5, "q"], [9, 3.5, "p"], [20, 4.5, "r"]]
+
+
+def test_mixed_and_oversized_columns_stay_lists():
+    table = OrderedTable(["a", "b"], ["x", "y"], [[1, 2 ** 70], [2.5, 3]])
+    assert table._store.columns == [[1, 2.5], [2 ** 70, 3]]
+    assert table["y"].data == [2.5, 3]
+
+
+def test_duplicate_ids_are_rejected():
+    with pytest.raises(ValueError):
+        OrderedTable(["a", "a"], ["x"], [[1, 2]])
+    with pytest.raises(ValueError):
+        OrderedTable(["a"], ["x", "x"], [[1], [2]])
+
+
+def test_ids_are_found_by_row_or_column(table):
+    assert table["y"]["b"] == 3.5
+    assert table["b"]["y"] == 3.5
+    assert table.row_ids.index("z") == 3
+    assert table.column_ids.index("c") == 2
+    with pytest.raises(KeyError):
+        table["missing"]
+
+
+def test_rows_and_columns_map_ids_to_arrays(table):
+    assert list(table.columns) == ["a", "b", "c"]
+    assert len(table.rows) == 4
+    assert table.rows["y"].data == [9, 3.5, "p"]
+    assert table["x":"z"].columns["a"].data == [5, 9]
+    assert "w" in table.rows and "w" not in table["x":"z"].rows
+    with pytest.raises(KeyError):
+        table.columns["missing"]
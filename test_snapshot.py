@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+
+def test_snapshot_is_isolated_from_later_writes(table):
+    table.create_index("a", "sorted")
+    snapshot = table.snapshot()
+    table["x"]["a"] = 50
+    table["c"] = ["s", "s", "s", "s"]
+    assert snapshot["a"].data == [1, 5, 9, 20]
+    assert snapshot["c"].data == ["p", "q", "p", "r"]
+    assert snapshot.where("a", between=(0, 10)).row_ids == ["w", "x", "y"]
+    assert table.where("a", between=(0, 10)).row_ids == ["w", "y"]
+    with pytest.raises(TypeError):
+        snapshot["x"]["a"] = 0
+
+
+def test_snapshot_waits_for_a_write_in_progress(table):
+    table.snapshot()
+    table["x"]["a"] = 50
+    snapshots = list()
+    # hold the lock as a write in progress would
+    with table._store._lock:
+        reader = threading.Thread(target=lambda: snapshots.append(table.snapshot()))
+        reader.start()
+        reader.join(0.05)
+        assert not snapshots
+    reader.join()
+    assert snapshots[0]["x"]["a"] == 50
+
+
+def test_snapshot_during_a_batch_has_every_write_before_it(table):
+    table.snapshot()
+    table["x"]["a"] = 50
+    started, written = threading.Event(), threading.Event()
+
+    def write_batch():
+        with table.batch():
+            table["y"]["a"] = 60
+            started.set()
+            written.wait()
+            table["z"]["a"] = 70
+
+    writer = threading.Thread(target=write_batch)
+    writer.start()
+    started.wait()
+    snapshot = table.snapshot()
+    written.set()
+    writer.join()
+    assert snapshot["a"].data == [1, 50, 9, 20]
+    assert table.snapshot()["a"].data == [1, 50, 60, 70]
@@ -0,0 +1,86 @@
+import pickle
+
+import pytest
+
+from columnstore import typecode
+from orderedtable import OrderedTable
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_and_load_round_trip(use_mmap, tmp_path):
+    row_ids = [f"r{i}" for i in range(40)]
+    data = [[i, i / 4, "pq"[i % 2], None if i % 3 else (i, "t")] for i in range(40)]
+    table = OrderedTable(["a", "b", "c", "d"], row_ids, data, default_value=0)
+    table.save(tmp_path / "t.bin")
+    loaded = OrderedTable.load(tmp_path / "t.bin", mmap=use_mmap)
+    assert loaded.column_ids == table.column_ids
+    assert loaded.row_ids == table.row_ids
+    assert loaded.data == table.data
+    assert loaded.default_value == 0
+    loaded["r1"]["a"] = 100
+    assert table["r1"]["a"] == 1
+    assert OrderedTable.load(tmp_path / "t.bin", mmap=use_mmap)["r1"]["a"] == 1
+
+
+class Payload:
+    def __reduce__(self):
+        return print, ("unpickled",)
+
+
+def test_load_refuses_to_unpickle_arbitrary_objects(tmp_path):
+    OrderedTable(["a"], ["x"], [[Payload()]]).save(tmp_path / "t.bin")
+    with pytest.raises(pickle.UnpicklingError):
+        OrderedTable.load(tmp_path / "t.bin")
+    OrderedTable(["a"], [Payload()], [[1]]).save(tmp_path / "t.bin")
+    with pytest.raises(pickle.UnpicklingError):
+        OrderedTable.load(tmp_path / "t.bin")
+
+
+def test_out_of_core_table_reads_and_writes_like_the_table_in_memory(tmp_path, table):
+    spilled = table.spill(tmp_path, chunk_rows=1, cache_chunks=2)
+    assert spilled.data == table.data
+    assert spilled["a"].sum() == 35
+    spilled["a"] = [0, 1, 2, 3]
+    assert spilled["a"].data == [0, 1, 2, 3]
+    assert spilled.cache_info().resident <= 2
+    assert table["a"].data == [1, 5, 9, 20]
+
+
+def test_export_and_import_round_trip():
+    row_ids = [f"r{i}" for i in range(40)]
+    data = [[i, None if i == 3 else i / 2, "pq"[i % 2], None if i % 5 else f"s{i}", (i,)] for i in range(40)]
+    table = OrderedTable(["a", "b", "c", "d", "e"], row_ids, data, default_value=0)
+    exported = table.export_buffers()
+    assert [column["type"] for column in exported["columns"]] == ["int64", "float64", "dictionary", "utf8",
+                                                                  "object"]
+    imported = OrderedTable.import_buffers(exported)
+    assert imported.column_ids == table.column_ids
+    assert imported.row_ids == table.row_ids
+    assert imported.data == table.data
+    assert imported.default_value == 0
+    view = table["r10":"r20"]["b":"d"]
+    assert OrderedTable.import_buffers(view.export_buffers()).data == view.data
+
+
+def test_writes_to_an_imported_table_leave_the_exporter_unchanged(table):
+    table.create_index("a")
+    snapshot = table.snapshot()
+    imported = OrderedTable.import_buffers(table.export_buffers())
+    imported["x"]["a"] = 99
+    imported["b"]["w":"y"] = [0.5, 0.5]
+    assert imported["a"].data == [1, 99, 9, 20]
+    assert imported["b"].data == [0.5, 0.5, 3.5, 4.5]
+    assert table["a"].data == [1, 5, 9, 20]
+    assert table["b"].data == [1.5, 2.5, 3.5, 4.5]
+    assert snapshot["a"].data == [1, 5, 9, 20]
+    assert table.where("a", equals=5).row_ids == ["x"]
+    assert typecode(imported._store.columns[0]) == "q"
+
+
+def test_exported_buffers_are_read_only(table):
+    exported = table.export_buffers()
+    assert exported["columns"][0]["values"].readonly
+    view = table["a"]._memoryview()
+    assert view.readonly
+    with pytest.raises(TypeError):
+        view[0] = 7
@@ -0,0 +1,29 @@
+
+
+
+def test_slices_are_views_over_rows_and_columns(table):
+    assert table["x":"z"].row_ids == ["x", "y"]
+    assert table["x":"z"].data == [[5, 2.5, "q"], [9, 3.5, "p"]]
+    assert table["b":].column_ids == ["b", "c"]
+    assert table["w"::2]["a"::2].data == [[1, "p"], [9, "p"]]
+    assert table["x"]["b":].data == [2.5, "q"]
+    assert table["a"]["x":].data == [5, 9, 20]
+    view = table["x":"z"]["a":"c"]
+    view["y"]["a"] = 90
+    assert table["y"]["a"] == 90
+    copy = table.copy()
+    copy["w"]["a"] = -1
+    assert table["w"]["a"] == 1
+
+
+def test_transpose_swaps_rows_and_columns_of_a_view(table):
+    transposed = table.transpose()
+    assert transposed.row_ids == ["a", "b", "c"]
+    assert transposed.column_ids == ["w", "x", "y", "z"]
+    assert transposed.data == table.transposed_data
+    assert transposed["x"].data == [5, 2.5, "q"]
+    assert transposed["a":"c"]["x":"z"].data == [[5, 9], [2.5, 3.5]]
+    assert transposed.transpose().data == table.data
+    transposed["b"]["w"] = 11.0
+    assert table["w"]["b"] == 11.0
+    assert transposed.copy().data == transposed.data
@@ -0,0 +1,15 @@
+
+
+
+def test_row_and_column_writes_are_seen_by_every_view(table):
+    row, column = table["x"], table["c"]
+    table["c"] = ["s", "t", "u", "v"]
+    assert row.data == [5, 2.5, "t"]
+    table["x"] = [0, 0.5, "o"]
+    assert column.data == ["s", "o", "u", "v"]
+    assert table["a"].data == [1, 0, 9, 20]
+    table["x":"z"] = [[7, 7.5, "m"], [8, 8.5, "n"]]
+    assert table.data == [[1, 1.5, "s"], [7, 7.5, "m"], [8, 8.5, "n"], [20, 4.5, "v"]]
+    table["a"]["w":"y"] = [2, 3]
+    table["z"]["a":"c"] = [21, 5.5]
+    assert table.transposed_data[:2] == [[2, 3, 8, 21], [1.5, 7.5, 8.5, 5.5]]
@@ -0,0 +1,206 @@
+"""
+Secondary indexes over the values of one column of a ColumnStore.
+
+An index maps values to the store rows that hold them. The store keeps its
+indexes up to date on every write and append, so lookups never scan the
+column. A HashIndex answers equality lookups in O(1), a SortedIndex also
+answers range lookups in O(log n). Both return row positions in ascending
+order, and both find the rows a scan of the column would find.
+
+Stores update indexes through add_rows and update_rows, which leave an
+index as it was when a value can not be indexed, so a failed write never
+loses rows from it. A sorted index takes large batches, such as the rows
+of a merge or a column write, with one merge of sorted runs instead of an
+insertion per row.
+"""
+from bisect import bisect_left, bisect_right, insort
+
+
+def _is_nan(value):
+    return value != value
+
+
+class HashIndex:
+    kind = "hash"
+    # whether the index answers between()
+    ranges = False
+
+    def __init__(self, values=()):
+        self.rows = dict()
+        # rows holding unhashable values or NaN, which no dict lookup finds, by row
+        self.unhashed = dict()
+        for row, value in enumerate(values):
+            self.add(row, value)
+
+    def add(self, row, value):
+        try:
+            if _is_nan(value):
+                raise TypeError("NaN is never equal to itself")
+            rows = self.rows.get(value)
+        except TypeError:
+            self.unhashed[row] = value
+            return
+        if rows is None:
+            self.rows[value] = {row}
+        else:
+            rows.add(row)
+
+    def remove(self, row, value):
+        if self.unhashed.pop(row, _MISSING) is not _MISSING:
+            return
+        rows = self.rows[value]
+        rows.discard(row)
+        if not rows:
+            del self.rows[value]
+
+    def equals(self, value):
+        try:
+            rows = set(self.rows.get(value, ()))
+        except TypeError:
+            rows = set()
+        rows.update(row for row, unhashed in self.unhashed.items() if unhashed == value)
+        return sorted(rows)
+
+    def between(self, low, high):
+        raise TypeError("a hash index can not answer range queries, create a sorted index")
+
+    def copy(self):
+        index = HashIndex()
+        index.rows = {value: set(rows) for value, rows in self.rows.items()}
+        index.unhashed = dict(self.unhashed)
+        return index
+
+
+class SortedIndex:
+    kind = "sorted"
+    ranges = True
+
+    def __init__(self, values=()):
+        # (value, row) pairs in order, values must be comparable with each other
+        self.entries = list()
+        # rows holding None or NaN, which have no place in the order, by row
+        self.unsorted = dict()
+        self.merge(range(len(values)), values)
+
+    def merge(self, rows, values):
+        """
+        adds many rows at once, in O(n + k log k) for k rows instead of the O(n k) of adding them one by one.
+        the index is only changed when every value can be ordered
+        """
+        entries = list()
+        unsorted = dict()
+        for row, value in zip(rows, values):
+            if value is None or _is_nan(value):
+                unsorted[row] = value
+            else:
+                entries.append((value, row))
+        if entries:
+            entries.sort()
+            # the sort finds the two sorted runs and merges them in linear time
+            merged = self.entries + entries
+            merged.sort()
+            self.entries = merged
+        self.unsorted.update(unsorted)
+
+    def replace(self, rows, new_values):
+        """moves many rows to new values at once, the index is only changed when every value can be ordered"""
+        rows = list(rows)
+        replaced = set(rows)
+        index = SortedIndex()
+        index.entries = [entry for entry in self.entries if entry[1] not in replaced]
+        index.unsorted = {row: value for row, value in self.unsorted.items() if row not in replaced}
+        index.merge(rows, new_values)
+        self.entries = index.entries
+        self.unsorted = index.unsorted
+
+    def add(self, row, value):
+        if value is None or _is_nan(value):
+            self.unsorted[row] = value
+        else:
+            insort(self.entries, (value, row))
+
+    def remove(self, row, value):
+        if self.unsorted.pop(row, _MISSING) is not _MISSING:
+            return
+        position = bisect_left(self.entries, (value, row))
+        if position == len(self.entries) or self.entries[position] != (value, row):
+            raise KeyError(f"the row {row} is not indexed under {value!r}")
+        del self.entries[position]
+
+    def _rows(self, start, stop):
+        return sorted(row for _, row in self.entries[start:stop])
+
+    def equals(self, value):
+        if value is None:
+            return sorted(row for row, unsorted in self.unsorted.items() if unsorted is None)
+        return self.between(value, value)
+
+    def between(self, low, high):
+        """rows with low <= value <= high"""
+        start = bisect_left(self.entries, (low,))
+        # (high, ) sorts before every (high, row) pair, so search past them with bisect on the values
+        stop = bisect_right(self.entries, high, lo=start, key=_value)
+        return self._rows(start, stop)
+
+    def copy(self):
+        index = SortedIndex()
+        index.entries = list(self.entries)
+        index.unsorted = dict(self.unsorted)
+        return index
+
+
+def _value(entry):
+    return entry[0]
+
+
+_MISSING = object()
+# sorted indexes take more rows than this at once with a merge, fewer are inserted one by one
+BULK_ROWS = 8
+
+INDEX_KINDS = {"hash": HashIndex, "sorted": SortedIndex}
+
+
+def make_index(values, kind="hash"):
+    try:
+        index_class = INDEX_KINDS[kind]
+    except KeyError:
+        raise ValueError(f"unknown index kind '{kind}', expected one of {sorted(INDEX_KINDS)}") from None
+    return index_class(values)
+
+
+def add_rows(index, rows, values):
+    """adds rows with their values, all of them or, when a value can not be indexed, none of them"""
+    if isinstance(index, SortedIndex) and len(rows) > BULK_ROWS:
+        index.merge(rows, values)
+        return
+    added = list()
+    try:
+        for row, value in zip(rows, values):
+            index.add(row, value)
+            added.append((row, value))
+    except TypeError:
+        for row, value in reversed(added):
+            index.remove(row, value)
+        raise
+
+
+def update_rows(index, rows, old_values, new_values):
+    """moves rows from their old values to new ones, all of them or, when a value can not be indexed, none"""
+    if isinstance(index, SortedIndex) and len(rows) > BULK_ROWS:
+        index.replace(rows, new_values)
+        return
+    moved = list()
+    try:
+        for row, old_value, value in zip(rows, old_values, new_values):
+            index.remove(row, old_value)
+            try:
+                index.add(row, value)
+            except TypeError:
+                index.add(row, old_value)
+                raise
+            moved.append((row, old_value, value))
+    except TypeError:
+        for row, old_value, value in reversed(moved):
+            index.remove(row, value)
+            index.add(row, old_value)
+        raise